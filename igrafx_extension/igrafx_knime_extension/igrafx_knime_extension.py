@@ -1,14 +1,73 @@
+import io
+import base64
 import logging
+import os
+import zipfile
+import hashlib
+import sqlite3
+import threading
+import contextlib
 import xml.etree.ElementTree as ET
 import tempfile
 import json
+import time
+import collections
+import concurrent.futures
+import itertools
+import random
+import copy
+import glob
 import knime.extension as knext
 import igrafx_mining_sdk as igx
 import requests as req
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 LOGGER = logging.getLogger(__name__)
 
+# Serializes the access of the worker threads to the state database
+_STATE_DB_LOCK = threading.Lock()
+
+# Statuses of a file whose ingestion is over, successfully or not
+_INGESTION_SUCCESS_STATUSES = {"INGESTED", "SUCCESS", "SUCCEEDED", "DONE", "COMPLETED", "PROCESSED"}
+_INGESTION_ERROR_STATUSES = {"ERROR", "FAILED", "FAILURE", "REJECTED", "CANCELED", "CANCELLED"}
+
+# Workgroups shared by all the iGrafx nodes of the Python process, keyed by a hash of their credentials and URLs
+_WORKGROUP_CACHE = {}
+_WORKGROUP_CACHE_LOCK = threading.Lock()
+# Locks serializing the logins of the same credentials, so that the cache lock is not held while logging in
+_WORKGROUP_LOGIN_LOCKS = {}
+# Lifetime assumed for a token whose expiry cannot be read, and margin kept before a token expires
+_DEFAULT_TOKEN_LIFETIME = 300
+_TOKEN_EXPIRY_MARGIN = 30
+
+# Metadata of the projects shared by all the iGrafx nodes, keyed by API URL, project ID and kind of metadata
+_METADATA_CACHE = {}
+_METADATA_CACHE_LOCK = threading.Lock()
+
+# SAP connections shared by the SAP nodes of the Python process, keyed by a hash of their URL and credentials
+_SAP_CONNECTIONS = {}
+_SAP_CONNECTIONS_LOCK = threading.Lock()
+# HTTP statuses of SAP responses after which the request is sent again
+_SAP_TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Directory of the descriptions of the SAP processes shipped with the extension
+_SAP_PROCESSES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sap_processes")
+# Rendered description XMLs of the SAP processes, keyed by a hash of their description
+_SAP_DESCRIPTION_CACHE = {}
+_SAP_DESCRIPTION_CACHE_LOCK = threading.Lock()
+
+# Columns of the table of SAP events
+_SAP_COLUMNS = ['Case ID', 'Entity ID', 'Entity Name', 'Document ID', 'Task Name', 'Event Type', 'Timestamp']
+_SAP_SCHEMA = pa.schema([(column, pa.string()) for column in _SAP_COLUMNS])
+
+# Keywords of the technical columns of the nodes datasource, which are not returned by the Project Data node
+_TECHNICAL_COLUMN_KEYWORDS = ["loop_path", "graphkey", "processkey", "ingestion_timestamp", "linkedToStart",
+                              "linkedToEnd"]
+
 igx_category = knext.category(
     path="/community",
     level_id="igrafx_extension",
@@ -18,6 +77,1429 @@ igx_category = knext.category(
 )
 
 
+def _token_expiry(workgroup):
+    """Returns the expiry time of the access token of a workgroup, read from the token itself.
+
+    Returns None if the token is not a JWT carrying an expiry time.
+    """
+    try:
+        token = workgroup.api_connector.token_header["Authorization"].split(" ", 1)[1]
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def _connect_workgroup(credentials):
+    """Returns the ID of the connection of the given credentials and its authenticated Workgroup.
+
+    Workgroups are cached in the Python process, so the nodes of a workflow share the same authenticated
+    Workgroup instead of logging in again. A Workgroup is created again once its token is about to expire.
+    The login happens outside of the cache lock, so that a slow authentication server only holds up the nodes
+    logging in with the same credentials.
+    """
+    connection_id = hashlib.sha256("\n".join(credentials).encode("utf-8")).hexdigest()
+
+    def cached_workgroup():
+        with _WORKGROUP_CACHE_LOCK:
+            cached = _WORKGROUP_CACHE.get(connection_id)
+        if cached is not None and cached[2] - _TOKEN_EXPIRY_MARGIN > time.time():
+            return cached[1]
+        return None
+
+    wg = cached_workgroup()
+    if wg is not None:
+        return connection_id, wg
+
+    with _WORKGROUP_CACHE_LOCK:
+        login_lock = _WORKGROUP_LOGIN_LOCKS.setdefault(connection_id, threading.Lock())
+    with login_lock:
+        # Another node may have logged in with the same credentials in the meantime
+        wg = cached_workgroup()
+        if wg is not None:
+            return connection_id, wg
+
+        wg = igx.Workgroup(*credentials)
+        # Do not keep a Workgroup whose login failed
+        if wg.api_connector.token_header:
+            expiry = _token_expiry(wg) or time.time() + _DEFAULT_TOKEN_LIFETIME
+            with _WORKGROUP_CACHE_LOCK:
+                _WORKGROUP_CACHE[connection_id] = (credentials, wg, expiry)
+        return connection_id, wg
+
+
+def _get_workgroup(connection):
+    """Returns the authenticated Workgroup of a connection given by the iGrafx Mining API Connection node.
+
+    The Workgroup of the connection is shared by the nodes of the workflow. It is created again from the cached
+    credentials once its token is about to expire.
+    """
+    with _WORKGROUP_CACHE_LOCK:
+        cached = _WORKGROUP_CACHE.get(connection.spec.connection_id)
+    if cached is not None:
+        return _connect_workgroup(cached[0])[1]
+    return connection.workgroup
+
+
+def _project_metadata(exec_context, my_project, kind, fetch):
+    """Returns metadata of a project, fetched with ``fetch`` if it is not cached yet or its cache has expired.
+
+    The metadata is cached for the number of seconds of the ``metadata_cache_ttl`` flow variable, so that the nodes
+    of a workflow run only fetch it once per project. The cache is not used if the flow variable is not set or is 0.
+    Empty or negative metadata, such as a column mapping that does not exist yet, is never cached, since it is
+    bound to change.
+    """
+    ttl = exec_context.flow_variables.get("metadata_cache_ttl", 0)
+    if ttl <= 0:
+        return fetch()
+
+    key = (my_project.api_connector.apiurl, my_project.id, kind)
+    now = time.monotonic()
+    with _METADATA_CACHE_LOCK:
+        cached = _METADATA_CACHE.get(key)
+    if cached is not None and cached[1] > now:
+        # Return a copy so that the cached metadata can not be modified by the node
+        return copy.deepcopy(cached[0])
+
+    value = fetch()
+    if value:
+        with _METADATA_CACHE_LOCK:
+            _METADATA_CACHE[key] = (copy.deepcopy(value), now + ttl)
+    return value
+
+
+def _invalidate_project_metadata(my_project):
+    """Removes the cached metadata of a project, after its mapping was changed or it was deleted."""
+    with _METADATA_CACHE_LOCK:
+        for key in [key for key in _METADATA_CACHE if key[:2] == (my_project.api_connector.apiurl, my_project.id)]:
+            del _METADATA_CACHE[key]
+
+
+class iGrafxConnectionSpec(knext.PortObjectSpec):
+    """Spec of an iGrafx Mining connection. It describes the connection without holding any credentials."""
+
+    def __init__(self, workgroup_id, api_url, auth_url, connection_id=None):
+        self._workgroup_id = workgroup_id
+        self._api_url = api_url
+        self._auth_url = auth_url
+        self._connection_id = connection_id
+
+    @property
+    def workgroup_id(self):
+        return self._workgroup_id
+
+    @property
+    def api_url(self):
+        return self._api_url
+
+    @property
+    def auth_url(self):
+        return self._auth_url
+
+    @property
+    def connection_id(self):
+        return self._connection_id
+
+    def serialize(self):
+        return {"workgroup_id": self._workgroup_id, "api_url": self._api_url, "auth_url": self._auth_url,
+                "connection_id": self._connection_id}
+
+    @classmethod
+    def deserialize(cls, data):
+        return cls(data["workgroup_id"], data["api_url"], data["auth_url"], data.get("connection_id"))
+
+
+class iGrafxConnectionPortObject(knext.ConnectionPortObject):
+    """Connection to the iGrafx Mining API, carrying the live authenticated Workgroup."""
+
+    def __init__(self, spec, workgroup):
+        super().__init__(spec)
+        self._workgroup = workgroup
+
+    @property
+    def workgroup(self):
+        return self._workgroup
+
+    def to_connection_data(self):
+        return self._workgroup
+
+    @classmethod
+    def from_connection_data(cls, spec, data):
+        return cls(spec, data)
+
+
+igx_connection_port_type = knext.port_type("iGrafx Mining Connection", iGrafxConnectionPortObject,
+                                           iGrafxConnectionSpec)
+
+
+def _ordered_bounded_map(func, items, max_workers, max_pending=None, on_discard=None):
+    """Applies ``func`` to every item with a pool of worker threads and yields the results in the order of the items.
+
+    At most ``max_pending`` items are in flight at any time, so a lazily produced iterable is only consumed as fast as
+    the workers can keep up with it. Pending work is cancelled if the consumer stops iterating early, or if a result
+    raises. If given, ``on_discard`` is called with the results that were already computed, or were being computed,
+    but will not be yielded, for instance to release the resources they hold.
+    """
+    def discard(future):
+        if not future.cancelled() and future.exception() is None:
+            on_discard(future.result())
+
+    max_pending = max(max_pending or 2 * max_workers, 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                if not future.cancel() and on_discard is not None:
+                    future.add_done_callback(discard)
+
+
+def _iter_table_chunks(table, chunk_size, row_filter=None):
+    """Yields the rows of a KNIME table as pandas DataFrames of ``chunk_size`` rows.
+
+    The table is consumed through its Arrow batches and only one batch is converted to pandas at a time,
+    so the memory used depends on the chunk size rather than on the size of the table.
+    ``chunk_size`` can also be a callable returning the number of rows of the next chunk.
+    If ``row_filter`` is given, it is applied to every batch and only the rows it returns are chunked.
+    """
+    next_chunk_size = chunk_size if callable(chunk_size) else lambda: chunk_size
+    if next_chunk_size() <= 0:
+        raise ValueError("The number of rows per chunk must be greater than 0.")
+
+    buffered = []
+    buffered_rows = 0
+    for batch in table.to_batches():
+        batch_df = batch.to_pandas()
+        if row_filter is not None:
+            batch_df = row_filter(batch_df)
+        buffered.append(batch_df)
+        buffered_rows += len(batch_df)
+        rows = next_chunk_size()
+        while buffered_rows >= rows:
+            data = pd.concat(buffered) if len(buffered) > 1 else buffered[0]
+            yield data.iloc[:rows]
+            remaining = data.iloc[rows:]
+            buffered = [remaining] if len(remaining) else []
+            buffered_rows = len(remaining)
+            rows = next_chunk_size()
+    if buffered_rows:
+        yield pd.concat(buffered) if len(buffered) > 1 else buffered[0]
+
+
+def _write_chunk_file(chunk_df, directory, chunk_index, charset, upload_format):
+    """Writes a chunk to a file of the given upload format in ``directory`` and returns the path of the file.
+
+    The chunk is streamed to the file, or to the compressed archive entry, without building the CSV in memory.
+    """
+    csv_name = f"chunk_{chunk_index}.csv"
+    if upload_format == UploadFormatOptions.ZIP.name:
+        file_path = os.path.join(directory, f"chunk_{chunk_index}.zip")
+        with zipfile.ZipFile(file_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            with archive.open(csv_name, "w") as entry, io.TextIOWrapper(entry, encoding=charset, newline="") as text:
+                chunk_df.to_csv(text, index=False)
+    else:
+        file_path = os.path.join(directory, csv_name)
+        chunk_df.to_csv(file_path, index=False, encoding=charset)
+    return file_path
+
+
+def _open_state_db(exec_context):
+    """Opens the SQLite database in which the iGrafx nodes keep their state between two executions.
+
+    The database is stored in the workflow data area, so it is saved and moved along with the workflow.
+    """
+    data_area_dir = exec_context.get_workflow_data_area_dir()
+    os.makedirs(data_area_dir, exist_ok=True)
+    db_path = os.path.join(data_area_dir, "igrafx_extension_state.sqlite")
+    connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    connection.execute("CREATE TABLE IF NOT EXISTS upload_journal ("
+                       "project_id TEXT NOT NULL, chunk_index INTEGER NOT NULL, chunk_hash TEXT NOT NULL, "
+                       "file_info TEXT NOT NULL, PRIMARY KEY (project_id, chunk_index, chunk_hash))")
+    # The projects are numbered so that the fingerprints of the rows do not repeat their project ID
+    connection.execute("CREATE TABLE IF NOT EXISTS delta_projects ("
+                       "project_key INTEGER PRIMARY KEY, project_id TEXT NOT NULL UNIQUE)")
+    connection.execute("CREATE TABLE IF NOT EXISTS delta_fingerprints ("
+                       "project_key INTEGER NOT NULL, fingerprint INTEGER NOT NULL, "
+                       "PRIMARY KEY (project_key, fingerprint)) WITHOUT ROWID")
+    connection.execute("CREATE TABLE IF NOT EXISTS sap_watermarks ("
+                       "endpoint TEXT NOT NULL, process_id TEXT NOT NULL, watermark TEXT NOT NULL, "
+                       "PRIMARY KEY (endpoint, process_id))")
+    connection.commit()
+    return connection
+
+
+def _forget_project_state(exec_context, project_id):
+    """Removes the upload journal and the delta index of a project from the state database, if it exists."""
+    if not os.path.exists(os.path.join(exec_context.get_workflow_data_area_dir(), "igrafx_extension_state.sqlite")):
+        return
+    with contextlib.closing(_open_state_db(exec_context)) as connection, _STATE_DB_LOCK:
+        connection.execute("DELETE FROM upload_journal WHERE project_id = ?", (project_id,))
+        connection.execute("DELETE FROM delta_fingerprints WHERE project_key IN "
+                           "(SELECT project_key FROM delta_projects WHERE project_id = ?)", (project_id,))
+        connection.execute("DELETE FROM delta_projects WHERE project_id = ?", (project_id,))
+        connection.commit()
+
+
+def _chunk_hash(chunk_df):
+    """Returns a hash of the content of a chunk, which does not depend on the format it is uploaded in."""
+    digest = hashlib.sha256(",".join(str(col) for col in chunk_df.columns).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(chunk_df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class _UploadJournal:
+    """Journal of the chunks of a project that were accepted by the iGrafx Mining platform.
+
+    It allows an interrupted upload to be resumed without sending the chunks that were already uploaded.
+    """
+
+    def __init__(self, connection, project_id):
+        self._connection = connection
+        self._project_id = project_id
+
+    def get(self, chunk_index, chunk_hash):
+        """Returns the information of the file the chunk was uploaded as, or None if it was not uploaded yet."""
+        with _STATE_DB_LOCK:
+            row = self._connection.execute("SELECT file_info FROM upload_journal "
+                                           "WHERE project_id = ? AND chunk_index = ? AND chunk_hash = ?",
+                                           (self._project_id, chunk_index, chunk_hash)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record(self, chunk_index, chunk_hash, file_info):
+        """Records that the chunk was uploaded as the given file."""
+        with _STATE_DB_LOCK:
+            self._connection.execute("INSERT OR REPLACE INTO upload_journal VALUES (?, ?, ?, ?)",
+                                     (self._project_id, chunk_index, chunk_hash, json.dumps(file_info)))
+            self._connection.commit()
+
+    def clear(self):
+        """Removes every chunk of the project from the journal, once the whole upload succeeded."""
+        with _STATE_DB_LOCK:
+            self._connection.execute("DELETE FROM upload_journal WHERE project_id = ?", (self._project_id,))
+            self._connection.commit()
+
+
+class _DeltaIndex:
+    """Index of the fingerprints of the rows already uploaded to a project.
+
+    A fingerprint is a 64-bit hash of the case ID, activity and time columns of a row, as declared in the column
+    mapping. It allows a table that is only appended to be uploaded again without sending the rows already sent.
+    The index is never pruned while the project exists: it takes about 16 bytes per uploaded row in the state
+    database, until it is reset or the project is deleted. If ``reset`` is True, the rows already uploaded are
+    forgotten.
+    """
+
+    def __init__(self, connection, project_id, column_mapping, reset=False):
+        self._connection = connection
+        with _STATE_DB_LOCK:
+            connection.execute("INSERT OR IGNORE INTO delta_projects (project_id) VALUES (?)", (project_id,))
+            connection.commit()
+            self._project_key = connection.execute("SELECT project_key FROM delta_projects WHERE project_id = ?",
+                                                   (project_id,)).fetchone()[0]
+        if reset:
+            self.reset()
+        self._key_positions = sorted({column_mapping.case_id_column.index, column_mapping.task_name_column.index,
+                                      *(column.index for column in column_mapping.time_columns)})
+
+    def fingerprints(self, df):
+        """Returns the fingerprints of the rows of a DataFrame laid out as described by the column mapping."""
+        hashes = pd.util.hash_pandas_object(df.iloc[:, self._key_positions], index=False)
+        # SQLite integers are signed
+        return hashes.to_numpy().view(np.int64)
+
+    def filter_new_rows(self, df):
+        """Returns the rows of the DataFrame that were not uploaded to the project yet."""
+        if df.empty:
+            return df
+        fingerprints = self.fingerprints(df)
+        with _STATE_DB_LOCK:
+            self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS delta_candidates (fingerprint INTEGER)")
+            self._connection.executemany("INSERT INTO delta_candidates VALUES (?)",
+                                         ((int(fingerprint),) for fingerprint in fingerprints))
+            known = self._connection.execute("SELECT c.fingerprint FROM delta_candidates c "
+                                             "JOIN delta_fingerprints d "
+                                             "ON d.project_key = ? AND d.fingerprint = c.fingerprint",
+                                             (self._project_key,)).fetchall()
+            self._connection.execute("DELETE FROM delta_candidates")
+        if not known:
+            return df
+        return df[~np.isin(fingerprints, np.fromiter((row[0] for row in known), dtype=np.int64))]
+
+    def record(self, df):
+        """Records the rows of the DataFrame as uploaded to the project."""
+        with _STATE_DB_LOCK:
+            self._connection.executemany("INSERT OR IGNORE INTO delta_fingerprints VALUES (?, ?)",
+                                         ((self._project_key, int(fingerprint))
+                                          for fingerprint in self.fingerprints(df)))
+            self._connection.commit()
+
+    def reset(self):
+        """Forgets all the rows uploaded to the project, so that they are all uploaded again."""
+        with _STATE_DB_LOCK:
+            self._connection.execute("DELETE FROM delta_fingerprints WHERE project_key = ?", (self._project_key,))
+            self._connection.commit()
+
+
+class _AdaptiveChunkSizer:
+    """Sizes the chunks by the size of the files they are uploaded as, rather than by a fixed number of rows.
+
+    The number of bytes per row is measured on every uploaded file and the number of rows of the next chunk is chosen
+    to reach the target file size. The target size itself shrinks when uploads are slow or fail, and grows back when
+    they are fast, within a quarter and twice the configured size.
+    """
+
+    initial_rows = 10000
+    target_seconds = 30.0
+
+    def __init__(self, target_bytes):
+        self._target_bytes = float(target_bytes)
+        self._min_bytes = target_bytes / 4
+        self._max_bytes = target_bytes * 2
+        self._bytes_per_row = None
+        self._lock = threading.Lock()
+
+    def next_chunk_rows(self):
+        """Returns the number of rows of the next chunk."""
+        with self._lock:
+            if self._bytes_per_row is None:
+                return self.initial_rows
+            return max(1, int(self._target_bytes / self._bytes_per_row))
+
+    def observe(self, rows, file_bytes, seconds):
+        """Records the upload of a chunk of ``rows`` rows, sent as ``file_bytes`` bytes in ``seconds`` seconds."""
+        with self._lock:
+            bytes_per_row = file_bytes / max(rows, 1)
+            # Exponential moving average, so that a single unusual chunk does not swing the chunk size
+            self._bytes_per_row = bytes_per_row if self._bytes_per_row is None else \
+                0.7 * self._bytes_per_row + 0.3 * bytes_per_row
+            if seconds > self.target_seconds:
+                self._target_bytes = max(self._min_bytes, self._target_bytes * 0.75)
+            elif seconds < self.target_seconds / 4:
+                self._target_bytes = min(self._max_bytes, self._target_bytes * 1.25)
+
+    def observe_failure(self, error):
+        """Halves the target size after a failed upload, as large requests are the first to time out."""
+        with self._lock:
+            self._target_bytes = max(self._min_bytes, self._target_bytes / 2)
+
+
+def _upload_chunks(my_project, chunks, charset, upload_format, max_concurrent_uploads, upload_retries,
+                   journal=None, delta_index=None, chunk_sizer=None):
+    """Uploads the chunks concurrently to the project and yields, in the chunk order, the information of the file
+    each chunk was uploaded as, along with its number of rows.
+
+    Every chunk is written in its own file inside a temporary directory which is always removed, even if the upload
+    fails. If a journal is given, the chunks it already contains are not uploaded again. If a delta index is given,
+    the rows of every uploaded chunk are recorded in it. If a chunk sizer is given, it is told how long every
+    upload took.
+    """
+    with tempfile.TemporaryDirectory(prefix="igx_upload_") as temp_dir:
+
+        def upload_chunk(indexed_chunk):
+            chunk_index, chunk_df = indexed_chunk
+            chunk_hash = _chunk_hash(chunk_df) if journal is not None else None
+            if journal is not None:
+                file_info = journal.get(chunk_index, chunk_hash)
+                if file_info is not None:
+                    return file_info, len(chunk_df)
+
+            chunk_file_path = None
+            try:
+                # Stream the chunk DataFrame straight to the file instead of building the CSV string in memory
+                chunk_file_path = _write_chunk_file(chunk_df, temp_dir, chunk_index, charset, upload_format)
+
+                # Add the file, retrying only this chunk if its upload fails
+                start = time.monotonic()
+                on_error = chunk_sizer.observe_failure if chunk_sizer is not None else None
+                file_info = _call_with_retries(my_project.add_file, chunk_file_path, retries=upload_retries,
+                                               on_error=on_error)
+                if chunk_sizer is not None:
+                    chunk_sizer.observe(len(chunk_df), os.path.getsize(chunk_file_path), time.monotonic() - start)
+            finally:
+                # Delete the file as soon as the chunk is uploaded
+                if chunk_file_path is not None and os.path.exists(chunk_file_path):
+                    os.remove(chunk_file_path)
+
+            if journal is not None:
+                journal.record(chunk_index, chunk_hash, file_info)
+            if delta_index is not None:
+                delta_index.record(chunk_df)
+            return file_info, len(chunk_df)
+
+        yield from _ordered_bounded_map(upload_chunk, enumerate(chunks), max_concurrent_uploads)
+
+
+def _page_items(page):
+    """Returns the list of items of a page returned by a paginated route of the iGrafx Mining API."""
+    if isinstance(page, list):
+        return page
+    if isinstance(page, dict):
+        lists = [value for value in page.values() if isinstance(value, list)]
+        for key in ("content", "items", "data"):
+            if isinstance(page.get(key), list):
+                return page[key]
+        if len(lists) == 1:
+            return lists[0]
+    return []
+
+
+def _iter_pages(fetch_page, first_page_index, limit, max_concurrent_requests, max_rows=0):
+    """Walks the pages of a paginated route and yields the items of every page, in the page order.
+
+    Several pages are fetched at the same time. The walk stops at the first page that is not full, or once
+    ``max_rows`` items were yielded if ``max_rows`` is not 0.
+    """
+    if limit <= 0:
+        raise ValueError("The limit must be greater than 0 to fetch all the pages.")
+
+    pages = _ordered_bounded_map(lambda page_index: _page_items(fetch_page(page_index)),
+                                 itertools.count(first_page_index), max_concurrent_requests,
+                                 max_pending=max_concurrent_requests)
+    yielded_rows = 0
+    try:
+        for items in pages:
+            page_is_full = len(items) >= limit
+            if max_rows:
+                items = items[:max_rows - yielded_rows]
+            if items:
+                yielded_rows += len(items)
+                yield items
+            if not page_is_full or (max_rows and yielded_rows >= max_rows):
+                break
+    finally:
+        pages.close()
+
+
+class _SeenFingerprints:
+    """Set of the 64-bit fingerprints of the items already yielded by a node, such as records or events.
+
+    The fingerprints are indexed in a private temporary SQLite database, which spills to the disk, so that the memory
+    used does not grow with the number of items. The database is deleted once closed.
+    """
+
+    def __init__(self):
+        self._index = sqlite3.connect("")
+        # The index is thrown away with the node execution, it does not need to survive a crash
+        self._index.execute("PRAGMA journal_mode = OFF")
+        self._index.execute("PRAGMA synchronous = OFF")
+        self._index.execute("CREATE TABLE seen (fingerprint INTEGER PRIMARY KEY)")
+        self._index.execute("CREATE TABLE candidates (fingerprint INTEGER PRIMARY KEY)")
+
+    def first_seen(self, fingerprints):
+        """Adds fingerprints to the set and returns a mask of the ones seen for the first time.
+
+        Only the first occurrence of a fingerprint repeated in ``fingerprints`` is marked as seen for the first time.
+        """
+        # SQLite integers are signed
+        fingerprints = np.asarray(fingerprints).view(np.int64)
+        unique_fingerprints, first_positions = np.unique(fingerprints, return_index=True)
+        self._index.executemany("INSERT INTO candidates VALUES (?)",
+                                ((int(fingerprint),) for fingerprint in unique_fingerprints))
+        known = self._index.execute("SELECT c.fingerprint FROM candidates c JOIN seen s "
+                                    "ON s.fingerprint = c.fingerprint").fetchall()
+        self._index.execute("INSERT OR IGNORE INTO seen SELECT fingerprint FROM candidates")
+        self._index.execute("DELETE FROM candidates")
+
+        mask = np.zeros(len(fingerprints), dtype=bool)
+        mask[first_positions] = True
+        if known:
+            mask &= ~np.isin(fingerprints, np.fromiter((row[0] for row in known), dtype=np.int64))
+        return mask
+
+    def close(self):
+        self._index.close()
+
+
+def _record_key(record):
+    """Returns the key identifying a record of a paginated route: its case ID if it has one, the record otherwise."""
+    if isinstance(record, dict):
+        for field in ("caseId", "case_id", "caseID", "id"):
+            if record.get(field) is not None:
+                return record[field]
+    return record
+
+
+def _unique_records(pages):
+    """Yields the pages with the records already yielded by a previous page removed.
+
+    Pages can shift while they are walked, if items are added or removed in between two requests,
+    which would otherwise duplicate records. A record is identified by a 64-bit hash of its case ID, so that a case
+    whose fields changed in between two requests is not returned twice.
+    """
+    with contextlib.closing(_SeenFingerprints()) as seen:
+        for records in pages:
+            keys = np.array([json.dumps(_record_key(record), sort_keys=True, default=str) for record in records],
+                            dtype=object)
+            mask = seen.first_seen(pd.util.hash_array(keys))
+            unique = [record for record, is_new in zip(records, mask) if is_new]
+            if unique:
+                yield unique
+
+
+def _records_to_frame(records):
+    """Flattens JSON records into a DataFrame. Nested objects become columns and lists are kept as JSON text.
+
+    Records that are plain values rather than objects are returned in a "value" column.
+    """
+    records = [record if isinstance(record, dict) else {"value": record} for record in records]
+    df = pd.json_normalize(records)
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].map(lambda value: json.dumps(value) if isinstance(value, (list, dict)) else value)
+    return df
+
+
+def _refers_to_time(name):
+    """Returns whether the name of a column refers to a date or a time."""
+    name = str(name)
+    return any(word in name.lower() for word in ("date", "time")) or name.endswith(("At", "_at"))
+
+
+def _parse_datetime_columns(df):
+    """Converts the text columns of a DataFrame whose name refers to a date or a time into datetime columns.
+
+    A column is only converted if all its values can be parsed.
+    """
+    for col in df.columns:
+        if not _refers_to_time(col) or not pd.api.types.is_string_dtype(df[col]):
+            continue
+        parsed = pd.to_datetime(df[col], errors="coerce", utc=True)
+        if parsed.notna().sum() == df[col].notna().sum():
+            df[col] = parsed
+    return df
+
+
+def _text_null_columns(schema):
+    """Returns an Arrow schema in which the columns that are empty, and thus have no type, are typed as text."""
+    return pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in schema])
+
+
+def _common_type(left, right):
+    """Returns the Arrow type that can hold the values of two types of a same column.
+
+    Empty columns take the type of the other one, integers are widened to 64 bits, and integers mixed with
+    decimals become decimals. Any other conflict falls back to text.
+    """
+    if left == right or pa.types.is_null(right):
+        return left
+    if pa.types.is_null(left):
+        return right
+    if pa.types.is_integer(left) and pa.types.is_integer(right):
+        return pa.int64()
+    if all(pa.types.is_integer(type_) or pa.types.is_floating(type_) for type_ in (left, right)):
+        return pa.float64()
+    return pa.string()
+
+
+def _unify_schemas(schemas):
+    """Returns a schema holding the columns of all the schemas, in the order they first appear, with their
+    common types."""
+    types = {}
+    for schema in schemas:
+        for field in schema:
+            types[field.name] = _common_type(types[field.name], field.type) if field.name in types else field.type
+    return _text_null_columns(pa.schema(list(types.items())))
+
+
+def _conform_table(table, schema):
+    """Converts an Arrow table to a schema, adding the columns it lacks as empty columns."""
+    columns = [table.column(field.name).cast(field.type) if field.name in table.column_names
+               else pa.nulls(table.num_rows, field.type) for field in schema]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _write_frames(frames):
+    """Writes dataframes into a KNIME table, one batch per dataframe."""
+    return _write_tables(pa.Table.from_pandas(frame, preserve_index=False) for frame in frames)
+
+
+def _write_tables(tables):
+    """Writes Arrow tables into a KNIME table, one batch per Arrow table.
+
+    The types of a column can change from a table to the next one, for instance when a column is empty in the
+    first page and filled in the following ones, and some columns may only appear in later pages. The tables are
+    thus first spooled to temporary Arrow files while their schemas are unified, then converted to the unified
+    schema as they are read back, so that all the batches share the same columns and types without holding the
+    whole data in memory.
+    """
+    with tempfile.TemporaryDirectory(prefix="igx_tables_") as temp_dir:
+        paths = []
+        schemas = []
+        for table in tables:
+            path = os.path.join(temp_dir, f"{len(paths)}.arrow")
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            paths.append(path)
+            schemas.append(table.schema)
+
+        if not paths:
+            return knext.Table.from_pandas(pd.DataFrame())
+
+        schema = _unify_schemas(schemas)
+        output = knext.BatchOutputTable.create(row_ids="generate")
+        for path in paths:
+            with pa.memory_map(path) as source:
+                output.append(_conform_table(pa.ipc.open_file(source).read_all(), schema))
+        return output
+
+
+def _write_record_pages(pages):
+    """Writes pages of JSON records into a KNIME table, one batch per page."""
+    return _write_frames(_records_to_frame(records) for records in pages)
+
+
+def _datasource_query(datasource, selection, conditions=()):
+    """Returns the SQL query selecting ``selection`` from a datasource, filtered by all the ``conditions``."""
+    sql = f"SELECT {selection} FROM {_sql_identifier(datasource.name)}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return sql
+
+
+def _iter_datasource_pages(datasource, selection, conditions, page_size):
+    """Yields the result of an SQL query on a datasource page by page, in time order.
+
+    The time range of the result is split into intervals of ``"__time"`` holding at most ``page_size`` rows, which
+    are counted before being fetched: an interval holding more rows is split in two, so that only one page is held in
+    memory at a time, and every row is read exactly once whatever the number of pages. Only the rows of a single
+    millisecond can make a page larger than ``page_size``. If ``page_size`` is 0, the whole result is fetched as a
+    single page.
+    """
+    if page_size == 0:
+        yield datasource.request(_datasource_query(datasource, selection, conditions))
+        return
+
+    def time_range(start, end):
+        return [*conditions, f'"__time" >= MILLIS_TO_TIMESTAMP({start})', f'"__time" < MILLIS_TO_TIMESTAMP({end})']
+
+    bounds = datasource.request(_datasource_query(
+        datasource, 'TIMESTAMP_TO_MILLIS(MIN("__time")) AS "start", TIMESTAMP_TO_MILLIS(MAX("__time")) AS "end", '
+                    'COUNT(*) AS "rows"', conditions))
+    rows = int(bounds["rows"].iloc[0]) if len(bounds) > 0 else 0
+    if rows == 0:
+        return
+    start, end = int(bounds["start"].iloc[0]), int(bounds["end"].iloc[0]) + 1
+
+    # First guess of the intervals, as if the rows were evenly spread over the time range
+    step = max((end - start) * page_size // rows, 1)
+    intervals = [(lower, min(lower + step, end)) for lower in range(start, end, step)]
+    intervals.reverse()
+    while intervals:
+        lower, upper = intervals.pop()
+        if upper - lower > 1:
+            count = datasource.request(_datasource_query(datasource, 'COUNT(*) AS "rows"', time_range(lower, upper)))
+            count = int(count["rows"].iloc[0]) if len(count) > 0 else 0
+            if count == 0:
+                continue
+            if count > page_size:
+                middle = (lower + upper) // 2
+                intervals.extend([(middle, upper), (lower, middle)])
+                continue
+        page = datasource.request(_datasource_query(datasource, selection, time_range(lower, upper)))
+        if len(page) > 0:
+            yield page
+
+
+def _project_data_column_name(column, column_name_mapping_infos):
+    """Returns the name of a column of the nodes datasource in the output of the Project Data node."""
+    # Replace the database column names of the metrics and dimensions by their names
+    if column in column_name_mapping_infos:
+        return column_name_mapping_infos[column]
+    # Replace the column name if it matches the pattern "case_+databasecolumnname"
+    if column.startswith("case_") and column[5:] in column_name_mapping_infos:
+        return f"{column_name_mapping_infos[column[5:]]} (case)"
+    return column
+
+
+def _is_technical_column(column):
+    """Returns whether a column of the project data is a technical column of the datasource."""
+    return any(keyword in column for keyword in _TECHNICAL_COLUMN_KEYWORDS)
+
+
+def _project_data_projection(columns, column_name_mapping_infos):
+    """Returns the positions of the columns of the project data that are kept, along with their new names."""
+    names = [_project_data_column_name(column, column_name_mapping_infos) for column in columns]
+    kept = [position for position, name in enumerate(names) if not _is_technical_column(name)]
+    return kept, [names[position] for position in kept]
+
+
+def _clean_project_data(tables, column_name_mapping_infos):
+    """Renames the columns of Arrow tables of project data after the column mapping and drops the technical
+    columns of the datasource.
+
+    The projection is computed once from the columns of the first table, and is applied to every table by only
+    changing its schema, without copying its data.
+    """
+    projection = None
+    for table in tables:
+        if projection is None:
+            projection = _project_data_projection(table.column_names, column_name_mapping_infos)
+        yield table.select(projection[0]).rename_columns(projection[1])
+
+
+def _to_timestamps(column):
+    """Parses a text column into UTC timestamps. The values that can not be parsed become missing values."""
+    return pa.array(pd.to_datetime(column.to_pandas(), errors="coerce", utc=True))
+
+
+def _to_numbers(column):
+    """Parses a text column into floating point numbers. The values that can not be parsed become missing values."""
+    return pa.array(pd.to_numeric(column.to_pandas(), errors="coerce"), type=pa.float64(), from_pandas=True)
+
+
+def _to_dictionary(column):
+    """Dictionary-encodes a text column, so that every distinct value is only stored once."""
+    return column.dictionary_encode()
+
+
+def _plan_type_conversions(table, metric_columns, max_distinct_ratio):
+    """Chooses the conversion of every text column of an Arrow table of project data, from its name and values.
+
+    Columns whose name refers to a date or a time become timestamps and metrics become numbers, if none of their
+    values is lost by the conversion. The other columns with few distinct values are dictionary-encoded.
+    """
+    conversions = {}
+    for position, field in enumerate(table.schema):
+        if not (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            continue
+        column = table.column(position)
+        for applies, conversion in ((_refers_to_time(field.name), _to_timestamps),
+                                    (field.name in metric_columns, _to_numbers)):
+            if applies and conversion(column).null_count == column.null_count:
+                conversions[position] = conversion
+                break
+        else:
+            if 0 < pc.count_distinct(column).as_py() <= max_distinct_ratio * len(column):
+                conversions[position] = _to_dictionary
+    return conversions
+
+
+def _optimize_project_data_types(tables, metric_columns, max_distinct_ratio=0.1):
+    """Converts the text columns of Arrow tables of project data to compact types: timestamps, numbers and
+    dictionary-encoded text.
+
+    The conversions are chosen once from the first table and applied to every table. A conversion that would lose
+    values of a later table, such as a metric that can not be parsed as a number, is not applied to that table:
+    its column is kept as text, and the whole column then falls back to text when the tables are written.
+    """
+    conversions = None
+    for table in tables:
+        if conversions is None:
+            conversions = _plan_type_conversions(table, metric_columns, max_distinct_ratio)
+        for position, conversion in conversions.items():
+            column = table.column(position)
+            converted = conversion(column)
+            if converted.null_count == column.null_count:
+                table = table.set_column(position, table.field(position).name, converted)
+        yield table
+
+
+def _split_list_parameter(value):
+    """Splits a comma-separated parameter into its stripped, non-empty values."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _sql_identifier(name):
+    """Quotes an identifier for a Druid SQL query."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_literal(value):
+    """Quotes a string literal for a Druid SQL query."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sql_timestamp(value):
+    """Converts a date or a date and time to a Druid SQL timestamp literal, in UTC."""
+    try:
+        timestamp = pd.Timestamp(value)
+    except ValueError:
+        raise ValueError(f"{value} is not a valid date or date and time.")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return f"TIMESTAMP '{timestamp:%Y-%m-%d %H:%M:%S}'"
+
+
+def _build_project_data_query(datasource, column_name_mapping_infos, columns=(), start_time="", end_time="",
+                              case_id_column="", case_ids=(), activity_column="", activities=()):
+    """Returns the selection and the conditions of the SQL query reading the project data from the nodes datasource.
+
+    The technical columns are left out of the query, as well as the columns that are not requested, and the filters
+    on the time, the case IDs and the activities are applied by the datasource.
+    """
+    available = {_project_data_column_name(column, column_name_mapping_infos): column
+                 for column in datasource.columns if not _is_technical_column(column)}
+    # Requested columns can be given by their name in the output or by their name in the datasource
+    available.update({column: column for column in list(available.values())})
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise ValueError(f"The columns {', '.join(unknown)} do not exist in the project data. "
+                         f"Available columns are: {', '.join(dict.fromkeys(available))}.")
+    selected = dict.fromkeys(available[column] for column in columns) if columns else \
+        dict.fromkeys(available.values())
+
+    conditions = []
+    if start_time:
+        conditions.append(f'"__time" >= {_sql_timestamp(start_time)}')
+    if end_time:
+        conditions.append(f'"__time" < {_sql_timestamp(end_time)}')
+    for column, values in ((case_id_column, case_ids), (activity_column, activities)):
+        if not values:
+            continue
+        if column not in datasource.columns:
+            raise ValueError(f"The column {column} does not exist in the datasource {datasource.name}.")
+        conditions.append(f"{_sql_identifier(column)} IN ({', '.join(_sql_literal(value) for value in values)})")
+
+    return ", ".join(_sql_identifier(column) for column in selected), conditions
+
+
+class _DatasourceCache:
+    """Local cache of the results of queries on a datasource, stored as Parquet files.
+
+    An entry is keyed by the API URL, the project ID and the query, and is only valid for a given freshness token of
+    the project. Once the cache exceeds its maximum size, the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def freshness_token(my_project):
+        """Returns a token that changes whenever a file is added to the project or its ingestion status changes."""
+        latest_files = my_project.get_project_files_metadata(page_index=0, limit=1, sort_order="DESC")
+        return hashlib.sha256(json.dumps(latest_files, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _path(self, key, freshness):
+        return os.path.join(self._directory, f"{key}_{freshness[:16]}.parquet")
+
+    def key(self, api_url, project_id, sql):
+        """Returns the key of the entry of a query on a project."""
+        return hashlib.sha256("\n".join([api_url, project_id, sql]).encode("utf-8")).hexdigest()[:32]
+
+    def get(self, key, freshness):
+        """Returns the path of the Parquet file of an entry, or None if the entry is not cached or is not fresh."""
+        path = self._path(key, freshness)
+        try:
+            # Mark the entry as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def store(self, key, freshness, tables):
+        """Stores the Arrow tables yielded by ``tables`` in an entry while yielding them back.
+
+        The types of a column can change from a table to the next one, so the tables are spooled to temporary Arrow
+        files while their schemas are unified, as in ``_write_tables``, and the entry is written with the unified
+        schema once all the tables were yielded. It replaces the stale entries of the same query.
+        """
+        path = self._path(key, freshness)
+        with tempfile.TemporaryDirectory(prefix="igx_cache_", dir=self._directory) as temp_dir:
+            spool_paths = []
+            schemas = []
+            for table in tables:
+                spool_path = os.path.join(temp_dir, f"{len(spool_paths)}.arrow")
+                with pa.OSFile(spool_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                spool_paths.append(spool_path)
+                schemas.append(table.schema)
+                yield table
+            if not spool_paths:
+                return
+
+            schema = _unify_schemas(schemas)
+            temp_path = os.path.join(temp_dir, "entry.parquet")
+            with pq.ParquetWriter(temp_path, schema) as writer:
+                for spool_path in spool_paths:
+                    with pa.memory_map(spool_path) as source:
+                        writer.write_table(_conform_table(pa.ipc.open_file(source).read_all(), schema))
+            for stale_path in glob.glob(os.path.join(self._directory, f"{key}_*.parquet")):
+                os.remove(stale_path)
+            os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self):
+        """Removes the least recently used entries until the cache fits in its maximum size."""
+        entries = []
+        for path in glob.glob(os.path.join(self._directory, "*.parquet")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def _iter_parquet_tables(path, batch_size):
+    """Yields the content of a Parquet file as Arrow tables of at most ``batch_size`` rows."""
+    parquet_file = pq.ParquetFile(path)
+    try:
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield pa.Table.from_batches([batch])
+    finally:
+        parquet_file.close()
+
+
+def _wait_for_ingestion(my_project, file_ids, max_concurrent_requests, timeout, initial_delay, max_delay=60):
+    """Polls the metadata of the files until all of them are ingested, and returns, in the order of the files,
+    their last metadata along with the number of seconds waited until they were seen as ingested.
+
+    The files are polled in rounds: every round fetches the metadata of all the files that are not ingested yet,
+    then waits with an exponential backoff with jitter before the next one. The wait time of a file is measured from
+    the start of the polling to the poll that first sees it as ingested, so it is only an upper bound of the time the
+    ingestion itself took. As soon as a file fails to be ingested, an error is raised. A status that is neither a
+    success nor an error status is considered in progress, and logged the first time it is seen.
+    """
+    start = time.monotonic()
+
+    def poll_file(file_id):
+        file_metadata = my_project.get_file_metadata(file_id)  # returns a json
+        return file_metadata, time.monotonic() - start
+
+    results = {}
+    logged_statuses = set(_INGESTION_SUCCESS_STATUSES | _INGESTION_ERROR_STATUSES)
+    pending = list(dict.fromkeys(file_ids))
+    delay = initial_delay
+    while pending:
+        still_pending = []
+        with contextlib.closing(_ordered_bounded_map(poll_file, pending, max_concurrent_requests)) as polled:
+            for file_id, (file_metadata, elapsed) in zip(pending, polled):
+                status = str(file_metadata.get("status", "")).upper()
+                if status in _INGESTION_ERROR_STATUSES:
+                    raise ValueError(f"The ingestion of the file {file_id} failed with the status {status}.")
+                if status in _INGESTION_SUCCESS_STATUSES:
+                    results[file_id] = (file_metadata, elapsed)
+                    continue
+                if status not in logged_statuses:
+                    logged_statuses.add(status)
+                    LOGGER.warning(f"The file {file_id} has the unknown status {status or '(none)'}, it is considered "
+                                   f"in progress until its status changes or the timeout is reached")
+                still_pending.append(file_id)
+        pending = still_pending
+        if not pending:
+            break
+
+        elapsed = time.monotonic() - start
+        if elapsed > timeout:
+            raise TimeoutError(f"The following files were not ingested after {timeout} seconds: "
+                               f"{', '.join(map(str, pending))}.")
+        time.sleep(min(delay, max_delay, timeout - elapsed) * random.uniform(0.5, 1.5))
+        delay *= 2
+
+    return [results[file_id] for file_id in file_ids]
+
+
+def _call_with_retries(func, *args, retries=3, backoff=1.0, on_error=None, retry_on=Exception):
+    """Calls ``func`` and calls it again with an exponential backoff if it raises, at most ``retries`` times.
+
+    If given, ``on_error`` is called with every exception raised by ``func``. Only the exceptions of the
+    ``retry_on`` types are retried.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args)
+        except retry_on as e:
+            if on_error is not None:
+                on_error(e)
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            LOGGER.warning(f"Attempt {attempt + 1} failed ({e}), retrying in {delay} seconds")
+            time.sleep(delay)
+
+
+def _iter_sap_events(stream):
+    """Parses an SAP extraction response incrementally and yields one row per event, in the order of the
+    ``_SAP_COLUMNS``.
+
+    A document without any event yields a single row without event information. The document groups and the cases
+    are cleared and removed from their parent once processed, so that the memory used does not grow with the size of
+    the response.
+    """
+    path = []
+    parents = []
+    case_id = ""
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            path.append(element.tag)
+            parents.append(element)
+            if path[1:] == ["Cases", "Case"]:
+                case_id = element.attrib['id']
+            continue
+        path.pop()
+        parents.pop()
+        if path[1:] == ["Cases", "Case"] and element.tag == "DocGroup":
+            entity_element = element.find('Entity')
+            document_element = element.find('Document')
+            entity_id = entity_element.attrib['id'] if entity_element is not None else ""
+            entity_name = entity_element.text if entity_element is not None else ""
+            document_id = document_element.attrib['id'] if document_element is not None else ""
+
+            event_elements = element.findall('.//Header/Events/Event')
+            if not event_elements:
+                yield case_id, entity_id, entity_name, document_id, "", "", ""
+            for event_element in event_elements:
+                event_type = event_element.attrib['type']
+                yield (case_id, entity_id, entity_name, document_id, f"{event_type} {entity_name}", event_type,
+                       event_element.attrib['ts'])
+            element.clear()
+            parents[-1].remove(element)
+        elif path[1:] == ["Cases"] and element.tag == "Case":
+            element.clear()
+            parents[-1].remove(element)
+        elif path[1:] == [] and element.tag == "Cases":
+            element.clear()
+
+
+def _iter_sap_batches(rows, batch_size):
+    """Groups the rows of SAP events into Arrow tables of at most ``batch_size`` rows, with the ``_SAP_SCHEMA``.
+
+    Empty values are converted to missing values and the time zone suffix is removed from the timestamps.
+    """
+    for batch in iter(lambda: list(itertools.islice(rows, batch_size)), []):
+        columns = [pa.array([value if value else None for value in values], type=pa.string())
+                   for values in zip(*batch)]
+        columns[-1] = pc.replace_substring(columns[-1], " CET", "")
+        yield pa.Table.from_arrays(columns, schema=_SAP_SCHEMA)
+
+
+def _sap_selection_xml(start_date, end_date):
+    """Builds the selection XML of an SAP extraction of the events between two dates."""
+    # Create the root element of the selection XML
+    selection_root_xml = ET.Element("Selection")
+
+    # Create and append FromDate element
+    from_date_element = ET.SubElement(selection_root_xml, "FromDate")
+    from_date_element.text = start_date
+
+    # Create and append ToDate element
+    to_date_element = ET.SubElement(selection_root_xml, "ToDate")
+    to_date_element.text = end_date
+
+    # Create and append ReadData element with attributes
+    read_data_element = ET.SubElement(selection_root_xml, "ReadData")
+    read_data_element.set("change_events", "X")
+    read_data_element.set("messages", "")
+    read_data_element.set("document_details", "")
+
+    # Convert the XML tree to a string
+    return ET.tostring(selection_root_xml, encoding='utf-8', method='xml').decode()
+
+
+def _build_xml_element(node):
+    """Builds an XML element from its JsonML description: a list made of the tag, an optional dictionary of
+    attributes, an optional text and the descriptions of the child elements."""
+    if not isinstance(node, list) or not node or not isinstance(node[0], str):
+        raise ValueError(f"Invalid XML element description: {node}")
+    element = ET.Element(node[0])
+    for item in node[1:]:
+        if isinstance(item, dict):
+            element.attrib.update(item)
+        elif isinstance(item, str):
+            element.text = item
+        else:
+            element.append(_build_xml_element(item))
+    return element
+
+
+def _load_sap_process_description(process):
+    """Returns the ID and the description XML of an SAP process.
+
+    ``process`` is either the name of a process shipped with the extension, such as O2C, or the path of a JSON
+    file describing the description XML in JsonML. The rendered XML is cached by the hash of the description.
+    """
+    path = process if os.path.isfile(process) else os.path.join(_SAP_PROCESSES_DIR, f"{process.lower()}.json")
+    if not os.path.isfile(path):
+        available = sorted(os.path.splitext(name)[0].upper() for name in os.listdir(_SAP_PROCESSES_DIR))
+        raise ValueError(f"The SAP process {process} does not exist. Available processes are: "
+                         f"{', '.join(available)}, or the path of a JSON process description.")
+    with open(path, "rb") as description_file:
+        content = description_file.read()
+    key = hashlib.sha256(content).hexdigest()
+
+    with _SAP_DESCRIPTION_CACHE_LOCK:
+        cached = _SAP_DESCRIPTION_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    description_root = _build_xml_element(json.loads(content))
+    process_id = description_root.findtext("ID")
+    if not process_id:
+        raise ValueError(f"The SAP process description {path} has no ID.")
+    # Convert the tree to a string
+    description_xml = ET.tostring(description_root, encoding='utf-8').decode('utf-8')
+    with _SAP_DESCRIPTION_CACHE_LOCK:
+        _SAP_DESCRIPTION_CACHE[key] = (process_id, description_xml)
+    return process_id, description_xml
+
+
+def _sap_date_format(date):
+    """Returns the format of a date given to SAP, either YYYYMMDD or YYYY-MM-DD."""
+    return "%Y%m%d" if date.strip().isdigit() else "%Y-%m-%d"
+
+
+def _sap_date_windows(start_date, end_date, window_days):
+    """Splits the period between two dates, both included, into consecutive windows of ``window_days`` days.
+
+    The dates of the windows are returned in the format of ``start_date``, either YYYYMMDD or YYYY-MM-DD.
+    """
+    date_format = _sap_date_format(start_date)
+    try:
+        start, end = pd.Timestamp(start_date.strip()), pd.Timestamp(end_date.strip())
+    except ValueError:
+        raise ValueError(f"The dates {start_date} and {end_date} are not valid dates.")
+    if end < start:
+        raise ValueError("The End Date must not be before the Start Date.")
+    windows = []
+    while start <= end:
+        window_end = min(start + pd.Timedelta(days=window_days - 1), end)
+        windows.append((f"{start:{date_format}}", f"{window_end:{date_format}}"))
+        start = window_end + pd.Timedelta(days=1)
+    return windows
+
+
+def _unique_sap_events(tables):
+    """Drops the SAP events that were already yielded, such as the events of a case extracted by two windows.
+
+    An event is identified by a 64-bit hash of its case ID, document ID, event type and timestamp.
+    """
+    with contextlib.closing(_SeenFingerprints()) as seen:
+        for table in tables:
+            keys = table.select(['Case ID', 'Document ID', 'Event Type', 'Timestamp']).to_pandas()
+            mask = seen.first_seen(pd.util.hash_pandas_object(keys, index=False).to_numpy())
+            if mask.any():
+                yield table.filter(pa.array(mask))
+
+
+def _iter_sap_window_tables(exec_context, fetch, windows, batch_size, max_concurrent_requests):
+    """Extracts the SAP events of date windows, several windows at the same time, and yields them in the order of
+    the windows as Arrow tables of at most ``batch_size`` rows.
+
+    ``fetch`` sends the request of a selection XML and returns the response, whose content is streamed. The requests
+    of the next windows are sent while a window is parsed, but a response is only parsed once the previous windows
+    are, so that at most one batch of events is held in memory. The events of a case spanning several windows are
+    extracted by each of them, and are only yielded once.
+    """
+    def iter_tables():
+        # The responses already received for the next windows are closed if a window fails or the extraction stops
+        responses = _ordered_bounded_map(lambda window: fetch(_sap_selection_xml(*window)), windows,
+                                         max_concurrent_requests, max_pending=max_concurrent_requests,
+                                         on_discard=lambda response: response.close())
+        with contextlib.closing(responses):
+            for window_index, response in enumerate(responses):
+                with contextlib.closing(response):
+                    yield from _iter_sap_batches(_iter_sap_events(response.raw), batch_size)
+                exec_context.set_progress((window_index + 1) / len(windows),
+                                          f"Extracted {window_index + 1} of {len(windows)} windows")
+
+    return _unique_sap_events(iter_tables())
+
+
+class _SAPWatermark:
+    """Timestamp of the latest event extracted from an SAP endpoint for a process, kept in the state database.
+
+    It allows the following extractions to only request the events from that timestamp on.
+    """
+
+    def __init__(self, connection, endpoint, process_id):
+        self._connection = connection
+        self._endpoint = endpoint
+        self._process_id = process_id
+        with _STATE_DB_LOCK:
+            row = self._connection.execute("SELECT watermark FROM sap_watermarks WHERE endpoint = ? AND process_id = ?",
+                                           (endpoint, process_id)).fetchone()
+        self._watermark = pd.Timestamp(row[0]) if row is not None else None
+        self._latest = self._watermark
+
+    def start_date(self, start_date, end_date, overlap_days):
+        """Returns the date from which the events are extracted: the day of the watermark minus the overlap,
+        unless the given start date is later. It is never later than the end date."""
+        if self._watermark is None:
+            return start_date
+        date_format = _sap_date_format(start_date)
+        start = self._watermark.normalize() - pd.Timedelta(days=overlap_days)
+        start = min(max(start, pd.Timestamp(start_date.strip())), pd.Timestamp(end_date.strip()))
+        return f"{start:{date_format}}"
+
+    def track(self, tables):
+        """Yields the tables of SAP events back while keeping track of the timestamp of their latest event."""
+        for table in tables:
+            latest = pd.to_datetime(table.column('Timestamp').to_pandas(), errors="coerce").max()
+            if pd.notna(latest) and (self._latest is None or latest > self._latest):
+                self._latest = latest
+            yield table
+
+    def save(self):
+        """Stores the timestamp of the latest event extracted, once the extraction succeeded."""
+        if self._latest is None or self._latest == self._watermark:
+            return
+        with _STATE_DB_LOCK:
+            self._connection.execute("INSERT OR REPLACE INTO sap_watermarks VALUES (?, ?, ?)",
+                                     (self._endpoint, self._process_id, self._latest.isoformat()))
+            self._connection.commit()
+        self._watermark = self._latest
+
+
+class _SAPConnection:
+    """Connection to an SAP extraction API.
+
+    The connection keeps its HTTP connections open and caches the CSRF token along with the session cookies, so
+    that they are reused by the following requests. The token is fetched again when SAP rejects it, and requests
+    that fail because of a network error or a transient status are sent again with an exponential backoff.
+    """
+
+    def __init__(self, url, username, password, verify, timeout, retries, pool_size=10):
+        self._url = url
+        self._verify = verify
+        self._timeout = timeout
+        self._retries = retries
+        self._csrf_token = None
+        self._lock = threading.Lock()
+        self._session = req.Session()
+        self._session.auth = (username, password)
+        adapter = req.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @classmethod
+    def get(cls, url, username, password, verify, timeout, retries):
+        """Returns the connection to an SAP API, creating it if it does not exist yet in this Python process."""
+        key = hashlib.sha256("\n".join([url, username, password, str(verify)]).encode("utf-8")).hexdigest()
+        with _SAP_CONNECTIONS_LOCK:
+            connection = _SAP_CONNECTIONS.get(key)
+            if connection is None:
+                connection = _SAP_CONNECTIONS[key] = cls(url, username, password, verify, timeout, retries)
+        connection._timeout = timeout
+        connection._retries = retries
+        return connection
+
+    def _check_response(self, response):
+        """Raises an HTTPError, which is retried, if the response has a transient status, and a ValueError if
+        the request failed otherwise."""
+        if response.ok:
+            return
+        response.close()
+        if response.status_code in _SAP_TRANSIENT_STATUSES:
+            raise req.HTTPError(f"SAP answered with the status {response.status_code}", response=response)
+        raise ValueError(f"SAP request failed. Status code: {response.status_code}, Reason: {response.reason}")
+
+    def _get_csrf_token(self):
+        """Returns the cached CSRF token, after fetching it if needed.
+
+        The token is taken from the response whatever its status, since some SAP services answer the fetch request
+        with an error status along with a valid token. The request only fails if the response has no token.
+        """
+        with self._lock:
+            if self._csrf_token is None:
+                response = self._session.get(self._url, headers={'X-CSRF-TOKEN': 'fetch'}, verify=self._verify,
+                                             timeout=self._timeout)
+                csrf_token = response.headers.get('x-csrf-token')
+                if not csrf_token:
+                    self._check_response(response)
+                    response.close()
+                    raise ValueError("SAP did not return a CSRF token.")
+                response.close()
+                self._csrf_token = csrf_token
+                LOGGER.info("Fetched a new SAP CSRF token")
+            return self._csrf_token
+
+    def _post_once(self, files):
+        csrf_token = self._get_csrf_token()
+        response = self._session.post(self._url, headers={'X-CSRF-TOKEN': csrf_token}, files=files,
+                                      verify=self._verify, timeout=self._timeout, stream=True)
+        if response.status_code == 403 and response.headers.get('x-csrf-token', '').lower() == 'required':
+            # The token or the session expired, fetch a new token before sending the request again
+            response.close()
+            with self._lock:
+                if self._csrf_token == csrf_token:
+                    self._csrf_token = None
+            raise req.HTTPError("The SAP CSRF token expired", response=response)
+        self._check_response(response)
+        # Decompress the response if it was sent compressed
+        response.raw.decode_content = True
+        return response
+
+    def post(self, files):
+        """Sends an extraction request to SAP and returns the response, whose content is streamed.
+
+        A request that timed out while SAP was extracting the data is not sent again, since SAP would start the
+        same extraction over. Connection timeouts are ``ConnectionError`` and are retried.
+        """
+        return _call_with_retries(self._post_once, files, retries=self._retries,
+                                  retry_on=(req.ConnectionError, req.HTTPError))
+
+
+def _extract_sap_tables(exec_context, stack, extraction_settings, connection_settings, batch_size):
+    """Extracts the events of an SAP process as configured by the ``SAPExtractionSettings`` and
+    ``SAPConnectionSettings`` of an SAP node, and returns an iterator over Arrow tables of at most ``batch_size``
+    events, along with the watermark of the extraction in incremental mode, or None.
+
+    The events are only requested and parsed while the iterator is consumed. The response and the state database
+    are closed along with ``stack``. The watermark must be saved once all the events were processed.
+    """
+    start_date = extraction_settings.start_date
+    end_date = extraction_settings.end_date
+    sap_api_url = connection_settings.sap_api_url
+    auth_username = connection_settings.auth_username
+    auth_pwd = connection_settings.auth_pwd
+
+    # Reuse the connection to SAP, along with its CSRF token, if it was already opened
+    connection = _SAPConnection.get(sap_api_url, auth_username, auth_pwd, connection_settings.verify_ssl,
+                                    (connection_settings.connect_timeout, connection_settings.read_timeout or None),
+                                    connection_settings.request_retries)
+
+    # Render the description XML of the process, which is cached as long as its description does not change
+    process_id, description_xml = _load_sap_process_description(extraction_settings.sap_process)
+
+    # Selection and Description XML have been generated
+
+    def fetch(selection_xml):
+        # Send the XMls to the SAP API and retrieve the response:
+        files = {
+            'selection': ('selection.xml', selection_xml, 'application/xml'),
+            'description': ('description.xml', description_xml, 'application/xml')
+        }
+        return connection.post(files)
+
+    watermark = None
+    if extraction_settings.incremental:
+        # Only extract the events from the latest event of the previous extraction on, minus the overlap
+        state_db = stack.enter_context(contextlib.closing(_open_state_db(exec_context)))
+        watermark = _SAPWatermark(state_db, sap_api_url, process_id)
+        start_date = watermark.start_date(start_date, end_date, extraction_settings.overlap_days)
+        LOGGER.info(f"Extracting the SAP events from {start_date} to {end_date}")
+
+    if extraction_settings.window_days > 0:
+        # Extract the period window by window, several windows at the same time
+        windows = _sap_date_windows(start_date, end_date, extraction_settings.window_days)
+        tables = _iter_sap_window_tables(exec_context, fetch, windows, batch_size,
+                                         extraction_settings.max_concurrent_requests)
+    else:
+        # The response of the Post request is parsed while it is received
+        response = stack.enter_context(contextlib.closing(fetch(_sap_selection_xml(start_date, end_date))))
+        tables = _iter_sap_batches(_iter_sap_events(response.raw), batch_size)
+
+    if watermark is not None:
+        tables = watermark.track(tables)
+    return tables, watermark
+
+
 @knext.node(name="iGrafx Mining API Connection",
             node_type=knext.NodeType.OTHER,
             icon_path="icons/igx_logo.png",
@@ -27,6 +1509,9 @@ igx_category = knext.category(
                                " into the node.")
 @knext.output_table(name="Output Table",
                     description="A Table Output that provides data (CSV or other) out of the node.")
+@knext.output_port(name="iGrafx Mining Connection",
+                   description="The authenticated connection to the iGrafx Mining API.",
+                   port_type=igx_connection_port_type)
 class iGrafxAPINode:
     """Node to connect to the iGrafx Mining API.
     The iGrafx Mining API Connection node serves as the gateway to establish a seamless
@@ -46,6 +1531,10 @@ class iGrafxAPINode:
     enabling users to perform various operations, such as data retrieval, analysis,
      and interaction with iGrafx Mining resources.
 
+    4. Shared Connection: The authenticated connection is given to the downstream iGrafx nodes through the
+    connection output port, so they reuse it instead of logging in again, and the Workgroup Key is never copied
+    to their flow variables.
+
     The iGrafx Mining API Connection node acts as a foundational element,
     empowering users to harness the full potential of the iGrafx Mining API and SDK functionalities within the
     KNIME analytics platform, enabling seamless data flow and interaction with iGrafx resources.
@@ -61,10 +1550,16 @@ class iGrafxAPINode:
                                     "The URL of the iGrafx Mining API platform you are using.")
     auth_url = knext.StringParameter("Authentication URL",
                                      "The authentication URL of the iGrafx Mining platform.")
+    metadata_cache_ttl = knext.IntParameter("Metadata Cache TTL (s)",
+                                            "The number of seconds during which the mappings of a project are kept "
+                                            "in memory by the downstream nodes instead of being fetched again. "
+                                            "If 0, they are fetched by every node.",
+                                            300, min_value=0)
 
     def configure(self, configure_context, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Connecting to iGrafx Mining API")
+        return input_schema, iGrafxConnectionSpec(self.workgroup_id, self.api_url, self.auth_url)
 
     def execute(self, exec_context, input_data):
         # Get authentication variables from flow variables
@@ -73,23 +1568,28 @@ class iGrafxAPINode:
         api_url = self.api_url
         auth_url = self.auth_url
 
-        # Establish connection by creating a Workgroup Object
-        wg = igx.Workgroup(w_id, w_key, api_url, auth_url)
+        # Establish connection by creating a Workgroup Object, which is then shared by the other iGrafx nodes
+        connection_id, wg = _connect_workgroup((w_id, w_key, api_url, auth_url))
 
         # Define flow variables
         exec_context.flow_variables["wg_id"] = w_id
-        exec_context.flow_variables["wg_key"] = w_key
         exec_context.flow_variables["api_url"] = api_url
         exec_context.flow_variables["auth_url"] = auth_url
+        exec_context.flow_variables["metadata_cache_ttl"] = self.metadata_cache_ttl
 
-        # Return input data as output
-        return input_data
+        # Return input data as output, along with the connection
+        connection_spec = iGrafxConnectionSpec(w_id, api_url, auth_url, connection_id)
+        return input_data, iGrafxConnectionPortObject(connection_spec, wg)
 
 
 @knext.node(name="iGrafx Mining Project Creation",
             node_type=knext.NodeType.OTHER,
             icon_path="icons/igx_logo.png",
             category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
@@ -122,11 +1622,11 @@ class iGrafxProjectCreationNode:
                                                 "The description of the project you want to create. "
                                                 "The description is optional.")
 
-    def configure(self, configure_context, input_schema):
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Creating iGrafx Mining Project")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
         # Retrieve project name and description from flow variables
         project_name = self.project_name
         project_description = self.project_description
@@ -137,12 +1637,7 @@ class iGrafxProjectCreationNode:
             column_mapping = None
 
         # Establish connection by creating a Workgroup Object
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Create the project
         new_project_id = wg.create_project(project_name, project_description).id
@@ -158,6 +1653,10 @@ class iGrafxProjectCreationNode:
             node_type=knext.NodeType.OTHER,
             icon_path="icons/igx_logo.png",
             category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
@@ -186,18 +1685,13 @@ class ColumnMappingStatusNode:
     given_project_id = knext.StringParameter("Project ID",
                                              "The ID of the project you want to check the column mapping.")
 
-    def configure(self, configure_context, input_schema):
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Checking Column Mapping Status")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
         # Get Workgroup object from the previous node to establish connection
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -213,7 +1707,8 @@ class ColumnMappingStatusNode:
         my_project = wg.project_from_id(project_id)
 
         # Check if column mapping exists in the project
-        column_mapping_exists = my_project.column_mapping_exists
+        column_mapping_exists = _project_metadata(exec_context, my_project, "column_mapping_exists",
+                                                  lambda: my_project.column_mapping_exists)
         exec_context.flow_variables["column_mapping_exists"] = column_mapping_exists
 
         # Raise an error if column mapping doesn't exist
@@ -224,8 +1719,56 @@ class ColumnMappingStatusNode:
         return input_data
 
 
+class ChunkingModeOptions(knext.EnumParameterOptions):
+    ROWS = ("Number of Rows", "Every chunk contains the configured number of rows.")
+    AUTO = ("Auto", "The chunks are sized to reach the target file size, which is adjusted during the upload "
+                    "depending on how fast the platform accepts the files.")
+
+
+class UploadFormatOptions(knext.EnumParameterOptions):
+    CSV = ("CSV", "Each chunk is uploaded as a plain CSV file.")
+    ZIP = ("ZIP", "Each chunk is uploaded as a CSV file compressed in a ZIP archive. "
+                  "Event logs with repetitive values compress well, which reduces the upload time.")
+
+
+@knext.parameter_group(label="Upload")
+class UploadSettings:
+    """How the chunks are uploaded to the iGrafx Mining platform."""
+
+    max_concurrent_uploads = knext.IntParameter("Max Concurrent Uploads",
+                                                "The maximum number of chunks uploaded at the same time. "
+                                                "The default value is 4.",
+                                                4,
+                                                min_value=1)
+    upload_format = knext.EnumParameter("Upload Format",
+                                        "The format in which the chunks are sent to the iGrafx Mining platform.",
+                                        UploadFormatOptions.CSV.name,
+                                        UploadFormatOptions)
+    upload_retries = knext.IntParameter("Retries per Chunk",
+                                        "The number of times the upload of a chunk is retried before the node fails. "
+                                        "Chunks that were already uploaded are not sent again. "
+                                        "The default value is 3.",
+                                        3,
+                                        min_value=0)
+    delta_upload = knext.BoolParameter("Upload New Rows Only",
+                                       "If checked, the node remembers the rows it uploaded to the project, "
+                                       "identified by their case ID, activity and time columns, and only uploads "
+                                       "the rows that are new since the previous executions. "
+                                       "This is meant for data that is only appended to.",
+                                       False)
+    reset_delta_index = knext.BoolParameter("Forget Uploaded Rows",
+                                            "If checked, the rows remembered for the project are forgotten before "
+                                            "the upload, so that all the rows are uploaded and remembered again. "
+                                            "Uncheck it once the node was executed.",
+                                            False)
+
+
 @knext.node(name="iGrafx Mining File Upload", node_type=knext.NodeType.MANIPULATOR, icon_path="icons/igx_logo.png",
             category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
@@ -251,7 +1794,16 @@ class iGrafxFileUploadNode:
     - Workgroup Object Connectivity: Establishes a secure connection to the iGrafx Mining API by utilizing
     the Workgroup Object, ensuring authentication and access permissions.
 
-    - Ability to upload a zip file: Allows users to upload a zip file to the iGrafx Mining platform.
+    - Ability to upload a zip file: Allows users to upload the chunks as compressed zip files to the iGrafx Mining
+    platform.
+
+    - Parallel Upload: Uploads several chunks at the same time and retries the chunks whose upload failed,
+    without sending the chunks that were already uploaded again.
+
+    - Resumable Upload: Optionally keeps a journal of the uploaded chunks so that a failed upload can be resumed
+    without duplicating the events already sent to the project.
+
+    - Delta Upload: Optionally uploads only the rows that were not sent to the project by previous executions.
 
     This node empowers users to seamlessly integrate file upload functionalities into their KNIME workflows,
     enabling efficient data transfer and synchronization with the iGrafx Mining platform. By leveraging this node,
@@ -267,26 +1819,40 @@ class iGrafxFileUploadNode:
                                     "The number of rows to process at a time. The default value is 100,000.",
                                     100000,
                                     min_value=0)
-
-    def configure(self, configure_context, input_schema):
+    chunking_mode = knext.EnumParameter("Chunking Mode",
+                                        "How the input table is split into chunks.",
+                                        ChunkingModeOptions.ROWS.name,
+                                        ChunkingModeOptions)
+    target_chunk_mb = knext.IntParameter("Target Chunk Size (MB)",
+                                         "The size of the files the chunks are uploaded as in auto chunking mode. "
+                                         "The default value is 50.",
+                                         50,
+                                         min_value=1)
+    resume_uploads = knext.BoolParameter("Resume Interrupted Uploads",
+                                         "If checked, the chunks accepted by the platform are recorded in a journal "
+                                         "kept in the workflow data area. If the upload fails, executing the node "
+                                         "again only uploads the chunks that were not accepted yet. The journal of "
+                                         "the project is cleared once the whole upload succeeded. It requires the "
+                                         "Number of Rows chunking mode.",
+                                         False)
+    upload = UploadSettings()
+
+    def configure(self, configure_context, connection_spec, input_schema):
+        # Auto chunks are cut depending on the upload timings, so a resumed upload would not cut them the same way
+        # and would send again the rows of the chunks it does not recognize
+        if self.resume_uploads and self.chunking_mode == ChunkingModeOptions.AUTO.name:
+            raise ValueError("Resume Interrupted Uploads requires the Number of Rows chunking mode.")
         # Set warning during configuration
         configure_context.set_warning("Uploading file to iGrafx")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
 
         column_dict = self.column_dict
         chunk_size = self.chunk_size
+        upload_retries = self.upload.upload_retries
 
         # Get Workgroup object from the previous node
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
-
-        # Get DataFrame from input table
-        df = input_data.to_pandas()
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -314,31 +1880,47 @@ class iGrafxFileUploadNode:
         column_mapping = igx.ColumnMapping.from_json(column_mapping)
 
         my_project.add_column_mapping(file_structure, column_mapping)
-
-        # List to store info about each uploaded file
-        uploaded_files_info = []
-
-        # Process each chunk and upload the corresponding file
-        for i in range(0, len(df), chunk_size):
-            # Convert the chunk DataFrame to a CSV string
-            chunk_df = df.iloc[i:i + chunk_size]
-
-            # Convert the chunk DataFrame to a CSV string
-            csv_data = chunk_df.to_csv(index=False)
-
-            # Create a temporary file and write the CSV data to it
-            temp_csv_file = tempfile.NamedTemporaryFile(suffix=".csv", delete=False)
-            temp_csv_file_path = temp_csv_file.name
-            # Write the CSV data to the temporary file
-            with open(temp_csv_file_path, 'w', encoding=file_structure.charset) as csv_file:
-                csv_file.write(csv_data)
-
-            # Add the file
-            file_info = my_project.add_file(temp_csv_file_path)
-            uploaded_files_info.append(file_info)
-
-            # Make sure the temp file is closed to be deleted
-            temp_csv_file.close()
+        _invalidate_project_metadata(my_project)
+
+        with contextlib.ExitStack() as stack:
+            journal = None
+            delta_index = None
+            if self.resume_uploads or self.upload.delta_upload:
+                state_db = stack.enter_context(contextlib.closing(_open_state_db(exec_context)))
+                if self.resume_uploads:
+                    journal = _UploadJournal(state_db, project_id)
+                if self.upload.delta_upload:
+                    delta_index = _DeltaIndex(state_db, project_id, column_mapping,
+                                              reset=self.upload.reset_delta_index)
+
+            # Size the chunks by number of rows, or by the size of their files in auto mode
+            chunk_sizer = None
+            if self.chunking_mode == ChunkingModeOptions.AUTO.name:
+                chunk_sizer = _AdaptiveChunkSizer(self.target_chunk_mb * 1024 * 1024)
+                chunk_size = chunk_sizer.next_chunk_rows
+
+            # Read the input table chunk by chunk, each chunk being uploaded as soon as it is ready
+            row_filter = delta_index.filter_new_rows if delta_index is not None else None
+            chunks = _iter_table_chunks(input_data, chunk_size, row_filter)
+
+            # List to store info about each uploaded file, in the order of the chunks
+            uploaded_files_info = []
+            uploaded_rows = 0
+            for file_info, chunk_rows in _upload_chunks(my_project, chunks, file_structure.charset,
+                                                        self.upload.upload_format, self.upload.max_concurrent_uploads,
+                                                        upload_retries, journal, delta_index, chunk_sizer):
+                uploaded_files_info.append(file_info)
+                uploaded_rows += chunk_rows
+                exec_context.set_progress(min(uploaded_rows / max(input_data.num_rows, 1), 1.0),
+                                          f"Uploaded {uploaded_rows} of {input_data.num_rows} rows")
+
+            if chunk_sizer is not None:
+                # Report the average number of rows of the uploaded chunks
+                chunk_size = uploaded_rows // max(len(uploaded_files_info), 1)
+
+            # The upload is complete, so a new execution must upload the data again
+            if journal is not None:
+                journal.clear()
 
         # Serialize the info about uploaded files to a JSON string
         uploaded_files_info_json = json.dumps(uploaded_files_info)
@@ -351,6 +1933,10 @@ class iGrafxFileUploadNode:
 
 @knext.node(name="iGrafx Mining Project Deletion", node_type=knext.NodeType.OTHER, icon_path="icons/igx_logo.png",
             category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
@@ -379,11 +1965,11 @@ class iGrafxProjectDeletionNode:
     given_project_id = knext.StringParameter("Project ID",
                                              "The ID of the project you want to delete.")
 
-    def configure(self, configure_context, input_schema):
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Deleting iGrafx Mining Project")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
         # Check if project ID is given
         project_id = self.given_project_id
 
@@ -391,25 +1977,28 @@ class iGrafxProjectDeletionNode:
             raise ValueError("No Project ID provided. Make sure to provide the Project ID for deletion.")
 
         # Establish connection by creating a Workgroup Object
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Delete the project
-        response_project_delete = wg.project_from_id(project_id).delete_project()
+        my_project = wg.project_from_id(project_id)
+        response_project_delete = my_project.delete_project()
+        _invalidate_project_metadata(my_project)
 
         if not response_project_delete.ok:
             raise ValueError(f"Project deletion failed. Status code: {response_project_delete.status_code}, "
                              f"Reason: {response_project_delete.text}")
+        # The rows and chunks uploaded to the project do not need to be remembered anymore
+        _forget_project_state(exec_context, project_id)
         # Return input data as output
         return input_data
 
 
 @knext.node(name="iGrafx Mining Project Mapping Info Fetcher", node_type=knext.NodeType.SOURCE,
             icon_path="icons/igx_logo.png", category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
@@ -444,19 +2033,14 @@ class iGrafxMappingInfoNode:
                                              "The ID of the project for which you "
                                              "want to retrieve mapping information.")
 
-    def configure(self, configure_context, input_schema):
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Getting Mapping Information")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
 
         # Get Workgroup object from the previous node
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -472,7 +2056,8 @@ class iGrafxMappingInfoNode:
         my_project = wg.project_from_id(project_id)
 
         # Get Mapping Infos of the project
-        mapping_infos = my_project.get_mapping_infos()  # returns a json
+        mapping_infos = _project_metadata(exec_context, my_project, "mapping_infos",
+                                          my_project.get_mapping_infos)  # returns a json
         exec_context.flow_variables["mapping_infos"] = str(mapping_infos)
 
         # Raise an error if mapping infos don't exist
@@ -486,10 +2071,16 @@ class iGrafxMappingInfoNode:
 @knext.node(name="iGrafx Mining Project Variant Fetcher", node_type=knext.NodeType.SOURCE,
             icon_path="icons/igx_logo.png",
             category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
                     description="A Table Output that provides data (CSV or other) out of the node.")
+@knext.output_table(name="Variants Table",
+                    description="A Table Output that provides the variants of the project.")
 class iGrafxProjectVariantNode:
     """Node to fetch project variants via the iGrafx Mining API.
 
@@ -505,6 +2096,8 @@ class iGrafxProjectVariantNode:
     - Pagination Support: The node supports pagination, allowing users to specify the page index and a limit for
     fetching project variants.
     - Search Functionality: Users can filter project variants by name using the optional search query parameter.
+    - All Pages Mode: The node can walk all the pages of variants, fetching several pages at once, and return them
+      in a table.
     - Seamless Integration: Integrates iGrafx API capabilities directly into KNIME workflows, facilitating efficient
       data retrieval and interaction with iGrafx Mining resources.
 
@@ -521,24 +2114,34 @@ class iGrafxProjectVariantNode:
                                "The maximum number of items to return per page.")
     search = knext.StringParameter("Search Query",
                                    "The search query to filter variants by name (optional).")
-
-    def configure(self, configure_context, input_schema):
+    fetch_all_pages = knext.BoolParameter("Fetch All Pages",
+                                          "If checked, all the pages of variants are fetched, starting from the page "
+                                          "index, and returned in the Variants Table. The limit is then the number "
+                                          "of variants fetched per request.",
+                                          False)
+    max_concurrent_requests = knext.IntParameter("Max Concurrent Requests",
+                                                 "The maximum number of pages fetched at the same time when all the "
+                                                 "pages are fetched. The default value is 4.",
+                                                 4,
+                                                 min_value=1)
+    max_rows = knext.IntParameter("Max Number of Variants",
+                                  "The maximum number of variants fetched when all the pages are fetched. "
+                                  "0 means that there is no limit.",
+                                  0,
+                                  min_value=0)
+
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Getting Project Variants")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
         # Fetch project variants using the provided parameters
         page_index_value = self.page_index
         limit_value = self.limit
         search_value = self.search
 
         # Get Workgroup object from the previous node
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -551,20 +2154,38 @@ class iGrafxProjectVariantNode:
             exec_context.flow_variables["new_project_id"] = project_id
 
         my_project = wg.project_from_id(project_id)
-        variants_data = my_project.get_project_variants(page_index=page_index_value, limit=limit_value,
-                                                        search=search_value)  # returns a json
-        exec_context.flow_variables["variants_data"] = str(variants_data)
 
-        # Return input data as output
-        return input_data
+        def fetch_page(page_index):
+            return my_project.get_project_variants(page_index=page_index, limit=limit_value,
+                                                   search=search_value)  # returns a json
+
+        if self.fetch_all_pages:
+            # Walk all the pages and stream them into the table, without going through the flow variables
+            pages = _iter_pages(fetch_page, page_index_value, limit_value, self.max_concurrent_requests,
+                                self.max_rows)
+        else:
+            variants_data = fetch_page(page_index_value)
+            exec_context.flow_variables["variants_data"] = str(variants_data)
+            pages = [_page_items(variants_data)]
+
+        variants_table = _write_record_pages(pages)
+
+        # Return input data as output, along with the variants
+        return input_data, variants_table
 
 
 @knext.node(name="iGrafx Mining Completed Cases", node_type=knext.NodeType.SOURCE, icon_path="icons/igx_logo.png",
             category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
                     description="A Table Output that provides data (CSV or other) out of the node.")
+@knext.output_table(name="Completed Cases Table",
+                    description="A Table Output that provides the completed cases of the project.")
 class iGrafxCompletedCasesNode:
     """Node to fetch completed cases for a specified project.
 
@@ -579,6 +2200,8 @@ class iGrafxCompletedCasesNode:
     - Pagination Support: The node supports pagination, allowing users to specify the page index and limit for fetching
       completed cases.
     - Search Functionality: Users can filter completed cases by case ID using the optional search query parameter.
+    - Bulk Export: The node can walk all the pages of completed cases, fetching several pages at once, and return
+      them in a table.
     - Error Handling: The node includes error handling for scenarios where there is no END CASE rule set or when
       unexpected exceptions occur.
 
@@ -595,24 +2218,29 @@ class iGrafxCompletedCasesNode:
                                "The maximum number of items to return per page.")
     search_case_id = knext.StringParameter("Search Query",
                                            "The search query to filter cases by ID (optional).")
-
-    def configure(self, configure_context, input_schema):
+    fetch_all_pages = knext.BoolParameter("Fetch All Pages",
+                                          "If checked, all the pages of completed cases are fetched, starting from "
+                                          "the page index, and returned in the Completed Cases Table. The limit is "
+                                          "then the number of cases fetched per request.",
+                                          False)
+    max_concurrent_requests = knext.IntParameter("Max Concurrent Requests",
+                                                 "The maximum number of pages fetched at the same time when all the "
+                                                 "pages are fetched. The default value is 4.",
+                                                 4,
+                                                 min_value=1)
+
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Getting Completed cases")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
         # Fetch completed cases using the provided parameters
         page_index_value = self.page_index
         limit_value = self.limit
         search_value = self.search_case_id
 
         # Get Workgroup object from the previous node
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -626,11 +2254,22 @@ class iGrafxCompletedCasesNode:
 
         my_project = wg.project_from_id(project_id)
 
+        def fetch_page(page_index):
+            return my_project.get_project_completed_cases(page_index=page_index,
+                                                          limit=limit_value,
+                                                          search_case_id=search_value)
+
         try:
-            completed_cases_data = my_project.get_project_completed_cases(page_index=page_index_value,
-                                                                          limit=limit_value,
-                                                                          search_case_id=search_value)
-            exec_context.flow_variables["completed_cases_data"] = str(completed_cases_data)
+            if self.fetch_all_pages:
+                # Walk all the pages and stream them into the table, without going through the flow variables
+                pages = _unique_records(_iter_pages(fetch_page, page_index_value, limit_value,
+                                                    self.max_concurrent_requests))
+            else:
+                completed_cases_data = fetch_page(page_index_value)
+                exec_context.flow_variables["completed_cases_data"] = str(completed_cases_data)
+                pages = [_page_items(completed_cases_data)]
+
+            completed_cases_table = _write_record_pages(pages)
 
         except req.exceptions.JSONDecodeError as je:
             exec_context.flow_variables["completed_cases_data"] = str(je)
@@ -641,12 +2280,16 @@ class iGrafxCompletedCasesNode:
             exec_context.flow_variables["completed_cases_data"] = str(e)
             raise ValueError(f"Unexpected exception: {e}")
 
-        # Return input data as output
-        return input_data
+        # Return input data as output, along with the completed cases
+        return input_data, completed_cases_table
 
 
 @knext.node(name="iGrafx Mining Project Data", node_type=knext.NodeType.SOURCE, icon_path="icons/igx_logo.png",
             category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Original Table",
@@ -664,6 +2307,12 @@ class iGrafxProjectDataNode:
     - Dynamic Configuration: Users can dynamically provide the Project ID as a parameter or use a predefined ID from
       flow variables.
     - Data Processing: This node processes the project data. It cleans it, filters it and converts it into a table.
+    - Batch Reading: The datasource can be read page by page and written to the output table batch by batch,
+      so that large projects can be read with a constant amount of memory.
+    - Filtering: Only the requested columns and the events of a time range, of some case IDs or of some activities
+      can be retrieved. The selection is done by the datasource, so that only the requested data is transferred.
+    - Local Cache: The data can be cached on the local disk, so that a project that did not change is not
+      downloaded again.
 
     This node facilitates efficient integration of project data into KNIME workflows, enabling users to synchronize with
     the iGrafx Mining platform seamlessly.
@@ -671,20 +2320,67 @@ class iGrafxProjectDataNode:
     # Define parameters to get project data
     given_project_id = knext.StringParameter("Project ID",
                                              "The ID of the project you want to retrieve data for.")
-
-    def configure(self, configure_context, input_schema):
+    read_in_batches = knext.BoolParameter("Read in Batches",
+                                          "If checked, the data of the project is read from the datasource page by "
+                                          "page and written to the output table batch by batch, so that large "
+                                          "projects can be read with a constant amount of memory.",
+                                          False)
+    batch_size = knext.IntParameter("Batch Size",
+                                    "The number of rows read from the datasource per page when reading in batches.",
+                                    100000, min_value=1)
+    columns = knext.StringParameter("Columns",
+                                    "The comma-separated names of the columns to retrieve. "
+                                    "If empty, all the columns are retrieved.",
+                                    "")
+    start_time = knext.StringParameter("Start Time",
+                                       "If set, only the events at or after this date and time (ISO 8601, UTC if no "
+                                       "time zone is given) are retrieved.",
+                                       "")
+    end_time = knext.StringParameter("End Time",
+                                     "If set, only the events before this date and time (ISO 8601, UTC if no time "
+                                     "zone is given) are retrieved.",
+                                     "")
+    case_ids = knext.StringParameter("Case IDs",
+                                     "If set, only the events of these comma-separated case IDs are retrieved.",
+                                     "")
+    activities = knext.StringParameter("Activities",
+                                       "If set, only the events of these comma-separated activities are retrieved.",
+                                       "")
+    case_id_column = knext.StringParameter("Case ID Column",
+                                           "The column of the datasource holding the case IDs, used to filter on "
+                                           "the case IDs.",
+                                           "caseid")
+    activity_column = knext.StringParameter("Activity Column",
+                                            "The column of the datasource holding the activities, used to filter on "
+                                            "the activities.",
+                                            "vertex_name")
+    optimize_types = knext.BoolParameter("Optimize Column Types",
+                                         "If checked, the columns whose name refers to a date or a time are parsed "
+                                         "into date and time columns, the metrics are converted to numbers and the "
+                                         "text columns with few distinct values are dictionary-encoded, which "
+                                         "reduces the memory used by the table.",
+                                         False)
+    use_cache = knext.BoolParameter("Use Local Cache",
+                                    "If checked, the data read from the datasource is cached on the local disk and "
+                                    "read from it again as long as no file was added to the project.",
+                                    False)
+    cache_directory = knext.StringParameter("Cache Directory",
+                                            "The directory of the local cache. If empty, a directory of the "
+                                            "temporary directory of the system is used.",
+                                            "")
+    cache_size_mb = knext.IntParameter("Cache Size (MB)",
+                                       "The maximum size of the local cache. Once it is exceeded, the least recently "
+                                       "used data is removed from the cache.",
+                                       1024, min_value=1)
+
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Getting Project Data")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
 
         # Get Workgroup object from the previous node
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -698,7 +2394,7 @@ class iGrafxProjectDataNode:
 
         my_project = wg.project_from_id(project_id)
 
-        mapping_infos = my_project.get_mapping_infos()
+        mapping_infos = _project_metadata(exec_context, my_project, "mapping_infos", my_project.get_mapping_infos)
 
         # Create a dictionary mapping database column names from mapping infos to their corresponding names
         # We get the database column names and names of the metrics and dimensions
@@ -706,32 +2402,64 @@ class iGrafxProjectDataNode:
         column_name_mapping_infos = {item['databaseColumnName']: item['name'] for category in mapping_infos.values()
                                      for item in category}
 
-        # Get and Load the dataframe of the datasource
-        df = my_project.nodes_datasource.load_dataframe()
-
-        # Rename the columns based on the mapping
-        df = df.rename(columns=column_name_mapping_infos)
-
-        # Check and replace the column name if it matches the pattern "case_+databasecolumnname"
-        df.rename(columns=lambda col: f"{column_name_mapping_infos[col[5:]]} (case)"
-                  if col.startswith("case_") and col[5:] in column_name_mapping_infos else col, inplace=True)
-
-        # Filter columns based on the condition
-        columns_to_keep = [col for col in df.columns if all(keyword not in col for keyword in
-                                                            ["loop_path", "graphkey", "processkey",
-                                                             "ingestion_timestamp", "linkedToStart", "linkedToEnd"])]
-
-        # Create a new DataFrame with the selected columns
-        filtered_df = df[columns_to_keep]
-
-        # Convert the filtered DataFrame to a KNIME Table
-        knime_df = knext.Table.from_pandas(filtered_df)
+        # Only the requested columns and rows are read from the datasource
+        datasource = my_project.nodes_datasource
+        selection, conditions = _build_project_data_query(datasource, column_name_mapping_infos,
+                                                          columns=_split_list_parameter(self.columns),
+                                                          start_time=self.start_time.strip(),
+                                                          end_time=self.end_time.strip(),
+                                                          case_id_column=self.case_id_column,
+                                                          case_ids=_split_list_parameter(self.case_ids),
+                                                          activity_column=self.activity_column,
+                                                          activities=_split_list_parameter(self.activities))
+        sql = _datasource_query(datasource, selection, conditions)
+        # Page through the datasource in time order, or load the whole dataframe of the datasource at once
+        page_size = self.batch_size if self.read_in_batches else 0
+        pages = (pa.Table.from_pandas(page, preserve_index=False)
+                 for page in _iter_datasource_pages(datasource, selection, conditions, page_size))
+
+        if self.use_cache:
+            # Read the data from the local cache if the project did not change since it was cached
+            cache = _DatasourceCache(self.cache_directory or os.path.join(tempfile.gettempdir(), "igrafx_cache"),
+                                     self.cache_size_mb * 1024 * 1024)
+            key = cache.key(my_project.api_connector.apiurl, project_id, sql)
+            freshness = _DatasourceCache.freshness_token(my_project)
+            cached_path = cache.get(key, freshness)
+            if cached_path is not None:
+                LOGGER.info(f"Reading the data of the project {project_id} from the cache.")
+                pages = _iter_parquet_tables(cached_path, self.batch_size)
+            else:
+                pages = cache.store(key, freshness, pages)
+
+        tables = _clean_project_data(pages, column_name_mapping_infos)
+        if self.optimize_types:
+            # Metrics are identified by their name, along with their case-level counterpart
+            metric_columns = {name for category, items in mapping_infos.items() if "metric" in category.lower()
+                              for item in items for name in (item['name'], f"{item['name']} (case)")}
+            tables = _optimize_project_data_types(tables, metric_columns)
+        if self.read_in_batches:
+            # Write the table batch by batch
+            knime_df = _write_tables(tables)
+        else:
+            # A cached result is read back in several parts, which are put together again. The types of a column
+            # can differ from a part to the next one once converted, so the parts are first given a common schema
+            tables = list(tables)
+            if not tables:
+                knime_df = knext.Table.from_pandas(pd.DataFrame())
+            else:
+                schema = _unify_schemas(table.schema for table in tables)
+                knime_df = knext.Table.from_pyarrow(pa.concat_tables([_conform_table(table, schema)
+                                                                      for table in tables]))
 
         # Return input data as output
         return input_data, knime_df
 
     @knext.node(name="iGrafx Mining Column Mapping Fetcher", node_type=knext.NodeType.SOURCE,
                 icon_path="icons/igx_logo.png", category=igx_category)
+    @knext.input_port(name="iGrafx Mining Connection",
+                      description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                                  "API Connection node.",
+                      port_type=igx_connection_port_type)
     @knext.input_table(name="Input Table",
                        description="A Table Input that allows users to provide or feed data (CSV or other) into the "
                                    "node.")
@@ -766,19 +2494,14 @@ class iGrafxProjectDataNode:
                                                  "The ID of the project for which "
                                                  "you want to retrieve column mapping.")
 
-        def configure(self, configure_context, input_schema):
+        def configure(self, configure_context, connection_spec, input_schema):
             # Set warning during configuration
             configure_context.set_warning("Retrieving Column Mapping")
 
-        def execute(self, exec_context, input_data):
+        def execute(self, exec_context, connection, input_data):
 
             # Get Workgroup object from the previous node
-            wg = igx.Workgroup(
-                exec_context.flow_variables["wg_id"],
-                exec_context.flow_variables["wg_key"],
-                exec_context.flow_variables["api_url"],
-                exec_context.flow_variables["auth_url"]
-            )
+            wg = _get_workgroup(connection)
 
             # Retrieve project ID from flow variables or manually set if provided
             if not self.given_project_id:
@@ -794,7 +2517,8 @@ class iGrafxProjectDataNode:
             my_project = wg.project_from_id(project_id)
 
             # Get Column Mapping of the project
-            retrieved_column_mapping = my_project.get_column_mapping()  # returns a json
+            retrieved_column_mapping = _project_metadata(exec_context, my_project, "column_mapping",
+                                                         my_project.get_column_mapping)  # returns a json
             exec_context.flow_variables["column_mapping"] = str(retrieved_column_mapping)
 
             # Raise an error if column mapping infos don't exist
@@ -807,6 +2531,10 @@ class iGrafxProjectDataNode:
 
 @knext.node(name="iGrafx Mining Project Files Info Fetcher", node_type=knext.NodeType.SOURCE,
             icon_path="icons/igx_logo.png", category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
@@ -849,23 +2577,18 @@ class iGrafxProfectFilesInfoNode:
                                        "The order in which to sort the results (ASC or DESC).",
                                        default_value="ASC")
 
-    def configure(self, configure_context, input_schema):
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Getting Project Files Information")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
         # Fetch project files info using the provided parameters
         page_index_value = self.page_index
         limit_value = self.limit
         sort_order = self.sort_order
 
         # Get Workgroup object from the previous node
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -888,6 +2611,10 @@ class iGrafxProfectFilesInfoNode:
 
 @knext.node(name="iGrafx Mining File Info Fetcher", node_type=knext.NodeType.SOURCE,
             icon_path="icons/igx_logo.png", category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
 @knext.input_table(name="Input Table",
                    description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
 @knext.output_table(name="Output Table",
@@ -914,6 +2641,12 @@ class iGrafxFileInfoNode:
     3. Dynamic Configuration: Allows users to dynamically provide the Project ID and File ID as parameters or use
     predefined values from the flow variables.
 
+    4. Concurrent Fetching: Fetches the information of several files at the same time and returns each metadata
+    field, such as the status or the dates, in its own column.
+
+    5. Ingestion Waiting: Optionally waits until all the files are ingested by the platform and returns how long
+    the ingestion of each file took.
+
     The iGrafx File Info Fetcher node facilitates the retrieval of essential file information, providing users with
     insights into the specific file associated with a project.
 
@@ -925,22 +2658,38 @@ class iGrafxFileInfoNode:
                                              "the variant information.")
     file_id = knext.StringParameter("File ID",
                                     "The ID of the file for which you want to get information.", )
-
-    def configure(self, configure_context, input_schema):
+    max_concurrent_requests = knext.IntParameter("Max Concurrent Requests",
+                                                 "The maximum number of file information fetched at the same time. "
+                                                 "The default value is 4.",
+                                                 4,
+                                                 min_value=1)
+    wait_for_ingestion = knext.BoolParameter("Wait for Ingestion",
+                                             "If checked, the node waits until all the files are ingested by the "
+                                             "platform and returns how long the ingestion of each file took. "
+                                             "The node fails as soon as the ingestion of a file fails.",
+                                             False)
+    ingestion_timeout = knext.IntParameter("Ingestion Timeout (s)",
+                                           "The maximum number of seconds to wait for the files to be ingested. "
+                                           "The default value is 3600.",
+                                           3600,
+                                           min_value=1)
+    poll_interval = knext.IntParameter("Initial Polling Interval (s)",
+                                       "The number of seconds to wait before checking the status of a file again. "
+                                       "This interval doubles after every check, up to one minute. "
+                                       "The default value is 5.",
+                                       5,
+                                       min_value=1)
+
+    def configure(self, configure_context, connection_spec, input_schema):
         # Set warning during configuration
         configure_context.set_warning("Getting Project Files Information")
 
-    def execute(self, exec_context, input_data):
+    def execute(self, exec_context, connection, input_data):
         # Fetch project variants using the provided parameters
         file_id = self.file_id
 
         # Get Workgroup object from the previous node
-        wg = igx.Workgroup(
-            exec_context.flow_variables["wg_id"],
-            exec_context.flow_variables["wg_key"],
-            exec_context.flow_variables["api_url"],
-            exec_context.flow_variables["auth_url"]
-        )
+        wg = _get_workgroup(connection)
 
         # Retrieve project ID from flow variables or manually set if provided
         if not self.given_project_id:
@@ -965,20 +2714,30 @@ class iGrafxFileInfoNode:
 
         my_project = wg.project_from_id(project_id)
 
-        # Fetch metadata for each file ID and store in flow variables
-        file_metadata_list = []
-        for file_info in file_id_list:
+        def fetch_file_metadata(file_info):
             file_id = file_info["id"]
             file_metadata = my_project.get_file_metadata(file_id)  # returns a json
             if 'id' in file_metadata:
                 del file_metadata['id']
-            file_metadata_list.append({"file_id": file_id, "metadata": json.dumps(file_metadata)})
-
-        # Convert the list of dictionaries to a pandas DataFrame
-        metadata_df = pd.DataFrame(file_metadata_list)
+            return {"File ID": file_id, **file_metadata}
+
+        if self.wait_for_ingestion:
+            # Poll all the files until they are ingested
+            file_ids = [file_info["id"] for file_info in file_id_list]
+            ingestion_results = _wait_for_ingestion(my_project, file_ids, self.max_concurrent_requests,
+                                                    self.ingestion_timeout, self.poll_interval)
+            file_metadata_list = []
+            for file_id, (file_metadata, wait_time) in zip(file_ids, ingestion_results):
+                file_metadata.pop('id', None)
+                file_metadata_list.append({"File ID": file_id, **file_metadata,
+                                           "Wait Time (s)": round(wait_time, 3)})
+        else:
+            # Fetch metadata for several file IDs at the same time, keeping the order of the files
+            file_metadata_list = list(_ordered_bounded_map(fetch_file_metadata, file_id_list,
+                                                           self.max_concurrent_requests))
 
-        # Rename columns for clarity
-        metadata_df.rename(columns={'file_id': 'File ID', 'metadata': 'Information'}, inplace=True)
+        # Expand the metadata into typed columns, one per metadata field
+        metadata_df = _parse_datetime_columns(_records_to_frame(file_metadata_list))
 
         # Convert the DataFrame to a KNIME table and return it
         knime_table = knext.Table.from_pandas(metadata_df)
@@ -986,6 +2745,64 @@ class iGrafxFileInfoNode:
         return input_data, knime_table
 
 
+@knext.parameter_group(label="SAP Extraction")
+class SAPExtractionSettings:
+    """The process and the period of an SAP extraction, and how the period is split and extracted."""
+
+    start_date = knext.StringParameter("Start Date",
+                                       "The date from when you want to retrieve information.",)
+    end_date = knext.StringParameter("End Date",
+                                     "The date until when you want to retrieve information.")
+    sap_process = knext.StringParameter("SAP Process",
+                                        "The SAP process to extract: the name of a process shipped with the "
+                                        "extension, such as O2C, or the path of a JSON file describing it.",
+                                        "O2C")
+    window_days = knext.IntParameter("Window Size (days)",
+                                     "If greater than 0, the period is split into windows of this number of days, "
+                                     "which are extracted separately and at the same time. If 0, the whole period is "
+                                     "extracted at once.",
+                                     0, min_value=0)
+    max_concurrent_requests = knext.IntParameter("Max Concurrent Requests",
+                                                 "The maximum number of windows extracted at the same time.",
+                                                 4, min_value=1)
+    incremental = knext.BoolParameter("Incremental Extraction",
+                                      "If checked, the timestamp of the latest event extracted is stored with the "
+                                      "workflow, and the next executions only extract the events from that day on, "
+                                      "minus the overlap.",
+                                      False)
+    overlap_days = knext.IntParameter("Overlap (days)",
+                                      "In incremental extraction, the number of days before the latest event "
+                                      "extracted that are extracted again, to catch the events recorded late.",
+                                      1, min_value=0)
+
+
+@knext.parameter_group(label="SAP Connection")
+class SAPConnectionSettings:
+    """The SAP API to extract the events from, its credentials, and how its requests are sent."""
+
+    sap_api_url = knext.StringParameter("SAP API URL",
+                                        "The URL of the SAP API to be used for data fetching.")
+    auth_username = knext.StringParameter("Authorization Username",
+                                          "The authorization username to be used for authentication.")
+    auth_pwd = knext.StringParameter("Authorization Password",
+                                     "The authorization password to be used for authentication.")
+    verify_ssl = knext.BoolParameter("Verify SSL Certificate",
+                                     "If checked, the SSL certificate of the SAP API is verified.",
+                                     False)
+    connect_timeout = knext.IntParameter("Connection Timeout (s)",
+                                         "The number of seconds to wait for the connection to the SAP API.",
+                                         30, min_value=1)
+    read_timeout = knext.IntParameter("Read Timeout (s)",
+                                      "The number of seconds to wait for data from the SAP API before the request is "
+                                      "considered failed. A request that timed out is not sent again. Set it to 0 "
+                                      "to wait for SAP without limit.",
+                                      3600, min_value=0)
+    request_retries = knext.IntParameter("Request Retries",
+                                         "The number of times a request that failed because of a network error or "
+                                         "a temporary unavailability of SAP is sent again.",
+                                         3, min_value=0)
+
+
 @knext.node(name="iGrafx SAP Data Fetcher", node_type=knext.NodeType.SOURCE, icon_path="icons/igx_logo.png",
             category=igx_category)
 @knext.output_table(name="SAP Table",
@@ -1006,8 +2823,11 @@ class iGrafxSAPNode:
 
     - **CSRF Token Handling**: Automatically handles CSRF token fetching for API authentication.
     - **XML Generation**: Automatically generates the necessary XML payloads for selection and description
-     to interact with the SAP API, eliminating the need to manually input XML files.
+     to interact with the SAP API, eliminating the need to manually input XML files. The description of the process
+     is read from a JSON file, so that other processes can be extracted without changing the node.
     - **Data Processing**: The node processes the data by cleaning, filtering, and converting it into a table format.
+    - **Streaming**: The response is parsed while it is received and the table is written batch by batch, so that
+      large extractions do not need to be held in memory.
 
     This node returns a table containing the fetched data. This table is retrieved in XML format,
     then cleaned and converted into a structured table.
@@ -1017,281 +2837,147 @@ class iGrafxSAPNode:
 
     """
 
-    start_date = knext.StringParameter("Start Date",
-                                       "The date from when you want to retrieve information.",)
-    end_date = knext.StringParameter("End Date",
-                                     "The date until when you want to retrieve information.")
-    sap_api_url = knext.StringParameter("SAP API URL",
-                                        "The URL of the SAP API to be used for data fetching.")
-    auth_username = knext.StringParameter("Authorization Username",
-                                          "The authorization username to be used for authentication.")
-    auth_pwd = knext.StringParameter("Authorization Password",
-                                     "The authorization password to be used for authentication.")
+    sap_connection = SAPConnectionSettings()
+    sap_extraction = SAPExtractionSettings()
+    batch_size = knext.IntParameter("Batch Size",
+                                    "The number of events written to the output table at once. The response of SAP "
+                                    "is parsed while it is received, so that only one batch is held in memory.",
+                                    100000, min_value=1)
 
     def configure(self, configure_context):
         # Set warning during configuration
         configure_context.set_warning("Getting SAP Data")
 
     def execute(self, exec_context):
+        with contextlib.ExitStack() as stack:
+            # The events are parsed while they are received, and written batch by batch
+            tables, watermark = _extract_sap_tables(exec_context, stack, self.sap_extraction,
+                                                    self.sap_connection, self.batch_size)
+            knime_df = _write_tables(tables)
+            if watermark is not None:
+                watermark.save()
 
-        start_date = self.start_date
-        end_date = self.end_date
-        sap_api_url = self.sap_api_url
-        auth_username = self.auth_username
-        auth_pwd = self.auth_pwd
-
-        headers = {
-            'X-CSRF-TOKEN': 'fetch',
-        }
-
-        session = req.Session()
-        session.auth = (auth_username, auth_pwd)
-        response = session.get(url=sap_api_url, headers=headers, verify=False)
-
-        # Access the CSRF token from the response's headers
-        csrf_token = response.headers.get('x-csrf-token')
-        print(f"CSRF Token: {csrf_token}\n")
-
-        # Print the Respons
-        print(response)
-
-        # Create the root element of the selection XML
-        selection_root_xml = ET.Element("Selection")
-
-        # Create and append FromDate element
-        from_date_element = ET.SubElement(selection_root_xml, "FromDate")
-        from_date_element.text = start_date
-
-        # Create and append ToDate element
-        to_date_element = ET.SubElement(selection_root_xml, "ToDate")
-        to_date_element.text = end_date
-
-        # Create and append ReadData element with attributes
-        read_data_element = ET.SubElement(selection_root_xml, "ReadData")
-        read_data_element.set("change_events", "X")
-        read_data_element.set("messages", "")
-        read_data_element.set("document_details", "")
-
-        # Convert the XML tree to a string
-        selection_xml = ET.tostring(selection_root_xml, encoding='utf-8', method='xml').decode()
-
-        # Create the root element of the description XML
-        description_root = ET.Element("Process")
-
-        # Add child elements to the root
-        ET.SubElement(description_root, "ID").text = "O2C"
-        ET.SubElement(description_root, "Product").text = "ERP"
-
-        # Create the Entities element
-        entities_element = ET.SubElement(description_root, "Entities")
-
-        identifiers_element = ET.SubElement(entities_element, "Identifiers")
-        ET.SubElement(identifiers_element, "Type").text = "DomVal"
-        ET.SubElement(identifiers_element, "Domain").text = "VBTYP"
-
-        leading_entities_element = ET.SubElement(entities_element, "LeadingEntities")
-        ET.SubElement(leading_entities_element, "EntityID").text = "B"
-        ET.SubElement(leading_entities_element, "EntityID").text = "C"
-
-        # Create ProcessStepsDescr element
-        process_steps_element = ET.SubElement(description_root, "ProcessStepsDescr")
-
-        status_element = ET.SubElement(process_steps_element, "Status", default='X')
-        data_tables_element = ET.SubElement(status_element, "DataTables")
-        data_table_vbuk_element = ET.SubElement(data_tables_element, "DataTable", id='VBUK')
-        fields_vbuk_element = ET.SubElement(data_table_vbuk_element, "Fields")
-        ET.SubElement(fields_vbuk_element, "Field", id='GBSTK')
-
-        messages_element = ET.SubElement(process_steps_element, "Messages", default='X')
-        data_table_nast_element = ET.SubElement(messages_element, "DataTable", id='NAST')
-        fields_nast_element = ET.SubElement(data_table_nast_element, "Fields")
-        ET.SubElement(fields_nast_element, "Field", id='KAPPL', dom_val_from='TNAPR-KAPPL')
-        ET.SubElement(fields_nast_element, "Field", id='OBJKY', source='VBELN')
-        ET.SubElement(fields_nast_element, "Field", id='KSCHL', semantic='message_type', dom_val_from='TNAPR-KSCHL')
-        ET.SubElement(fields_nast_element, "Field", id='SPRAS')
-        ET.SubElement(fields_nast_element, "Field", id='PARNR')
-        ET.SubElement(fields_nast_element, "Field", id='USNAM', semantic='user')
-        ET.SubElement(fields_nast_element, "Field", id='PARVW', dom_val_from='VBPA-PARVW')
-        ET.SubElement(fields_nast_element, "Field", id='ERDAT', semantic='crea_timestamp-date')
-        ET.SubElement(fields_nast_element, "Field", id='ERUHR', semantic='crea_timestamp-time')
-
-        # Create ProcessSteps elements
-        process_steps_element = ET.SubElement(process_steps_element, "ProcessSteps")
-
-        for entity_id, header_table, item_table, change_object_class, kappl_value in [
-            ("B", "VBAK", "VBAP", "VERKBELEG", "V1"),
-            ("C", "VBAK", "VBAP", "VERKBELEG", "V1"),
-            ("J", "LIKP", "LIPS", "LIEFERUNG", "V2"),
-            ("M", "VBRK", "VBRP", "FAKTBELEG", "V2")
-        ]:
-            process_step = ET.SubElement(process_steps_element, "ProcessStep")
-            ET.SubElement(process_step, "EntityID").text = entity_id
-
-            executables_element = ET.SubElement(process_step, "Executables")
-            for action, mod_type in [("01", "create"), ("02", "change")]:
-                executable = ET.SubElement(executables_element, "Executable", mod_type=mod_type)
-                ET.SubElement(executable, "Type").text = "TRAN"
-                ET.SubElement(executable, "ID").text = f"VA{action}"
-                ET.SubElement(executable, "Event").text = "Create" if action == "01" else "Change"
-
-            ET.SubElement(process_step, "HeaderDataTable").text = header_table
-            ET.SubElement(process_step, "ItemDataTable").text = item_table
-            ET.SubElement(process_step, "ChangeObjectClass").text = change_object_class
-
-            messages_step = ET.SubElement(process_step, "Messages")
-            data_table_nast_step = ET.SubElement(messages_step, "DataTable", id='NAST')
-            fields_nast_step = ET.SubElement(data_table_nast_step, "Fields")
-            ET.SubElement(fields_nast_step, "Field", id='KAPPL').text = kappl_value
-
-        # Create ProcessFlow element
-        process_flow_element = ET.SubElement(description_root, "ProcessFlow")
-        data_table_vbfa = ET.SubElement(process_flow_element, "DataTable", id='VBFA')
-        ET.SubElement(data_table_vbfa, "PredecessorEntity").text = "VBTYP_V"
-        ET.SubElement(data_table_vbfa, "SuccessorEntity").text = "VBTYP_N"
-        ET.SubElement(data_table_vbfa, "PredecessorHeaderKey").text = "VBELV"
-        ET.SubElement(data_table_vbfa, "SuccessorHeaderKey").text = "VBELN"
-        ET.SubElement(data_table_vbfa, "PredecessorItemKey").text = "POSNV"
-        ET.SubElement(data_table_vbfa, "SuccessorItemKey").text = "POSNN"
-
-        # Create DataTables element
-        data_tables_element = ET.SubElement(description_root, "DataTables")
-
-        for id_value, header_table, fields_info in [
-            ('VBUK', 'X', [{'id': 'VBELN', 'header_key': 'X'}, {'id': 'GBSTK', 'read_value_texts': 'X'}]),
-            ('VBAK', '', [
-                {'id': 'VBELN', 'header_key': 'X'}, {'id': 'VBTYP', 'entity_id': 'X'},
-                {'id': 'UPD_TMSTMP', 'semantic': 'change_timestamp'},
-                {'id': 'ERDAT', 'semantic': 'crea_timestamp-date'}, {'id': 'ERZET', 'semantic': 'crea_timestamp-time'},
-                {'id': 'ERNAM', 'semantic': 'crea_user'}, {'id': 'AUART', 'read_value_texts': 'X'}, {'id': 'AUDAT'}
-            ]),
-            ('VBAP', '', [
-                {'id': 'VBELN', 'header_key': 'X'}, {'id': 'POSNR', 'item_key': 'X'}, {'id': 'MATNR'}, {'id': 'MATKL'},
-                {'id': 'MEINS'}, {'id': 'NETPR'}, {'id': 'NETWR'}, {'id': 'SMENG'},
-                {'id': 'ERDAT', 'semantic': 'crea_timestamp-date'},
-                {'id': 'ERZET', 'semantic': 'crea_timestamp-time'}, {'id': 'ERNAM', 'semantic': 'crea_user'}
-            ]),
-            ('VBRK', '', [
-                {'id': 'VBELN', 'header_key': 'X'}, {'id': 'VBTYP', 'entity_id': 'X'}, {'id': 'AEDAT'},
-                {'id': 'ERDAT', 'semantic': 'crea_timestamp-date'}, {'id': 'ERZET', 'semantic': 'crea_timestamp-time'},
-                {'id': 'ERNAM', 'semantic': 'crea_user'}, {'id': 'FKDAT'}, {'id': 'FKART', 'read_value_texts': 'X'}
-            ]),
-            ('VBRP', '', [
-                {'id': 'VBELN', 'header_key': 'X'}, {'id': 'POSNR', 'item_key': 'X'}, {'id': 'NETWR'}, {'id': 'FKIMG'},
-                {'id': 'VRKME'}, {'id': 'MATNR'}, {'id': 'MATKL'}, {'id': 'ERDAT', 'semantic': 'crea_timestamp-date'},
-                {'id': 'ERZET', 'semantic': 'crea_timestamp-time'}, {'id': 'ERNAM', 'semantic': 'crea_user'}
-            ]),
-            ('LIKP', '', [
-                {'id': 'VBELN', 'header_key': 'X'}, {'id': 'VBTYP', 'entity_id': 'X'}, {'id': 'AEDAT'},
-                {'id': 'ERDAT', 'semantic': 'crea_timestamp-date'}, {'id': 'ERZET', 'semantic': 'crea_timestamp-time'},
-                {'id': 'ERNAM', 'semantic': 'crea_user'}, {'id': 'LFDAT'}, {'id': 'LFART', 'read_value_texts': 'X'}
-            ]),
-            ('LIPS', '', [
-                {'id': 'VBELN', 'header_key': 'X'}, {'id': 'POSNR', 'item_key': 'X'}, {'id': 'MATKL'},
-                {'id': 'LFIMG'}, {'id': 'VRKME'}, {'id': 'NETPR'}, {'id': 'NETWR'}, {'id': 'MATNR'},
-                {'id': 'ERDAT', 'semantic': 'crea_timestamp-date'}, {'id': 'ERZET', 'semantic': 'crea_timestamp-time'},
-                {'id': 'ERNAM', 'semantic': 'crea_user'}
-            ])
-        ]:
-            data_table = ET.SubElement(data_tables_element, "DataTable", id=id_value)
-            if header_table:
-                data_table.set("header_table", header_table)
-            fields = ET.SubElement(data_table, "Fields")
-            for field_info in fields_info:
-                ET.SubElement(fields, "Field", field_info)
-
-        # Convert the tree to a string
-        description_xml = ET.tostring(description_root, encoding='utf-8').decode('utf-8')
-
-        # Selection and Description XML have been generated
-
-        # Send the XMls to the SAP API and retrieve the response:
-        files = {
-            'selection': ('selection.xml', selection_xml, 'application/xml'),
-            'description': ('description.xml', description_xml, 'application/xml')
-        }
-        headers2 = {
-            'X-CSRF-TOKEN': csrf_token,
-        }
+        return knime_df
 
-        # The response of the Post request:
-        response = session.post(sap_api_url, headers=headers2, files=files, verify=False)
 
-        print(f"The response is: {response.text}")
+@knext.node(name="iGrafx SAP to Mining Uploader", node_type=knext.NodeType.OTHER, icon_path="icons/igx_logo.png",
+            category=igx_category)
+@knext.input_port(name="iGrafx Mining Connection",
+                  description="The connection to the iGrafx Mining API established by the iGrafx Mining "
+                              "API Connection node.",
+                  port_type=igx_connection_port_type)
+@knext.input_table(name="Input Table",
+                   description="A Table Input that allows users to provide or feed data (CSV or other) into the node.")
+@knext.output_table(name="Output Table",
+                    description="A Table Output that provides data (CSV or other) out of the node.")
+class iGrafxSAPUploadNode:
+    """Node to extract SAP data and upload it to a project of the iGrafx Mining platform.
 
-        # Parse the XML Response file
-        xml_tree = ET.ElementTree(ET.fromstring(response.text))
+    The iGrafx SAP to Mining Uploader node combines the iGrafx SAP Data Fetcher and the iGrafx Mining File Upload
+    nodes. The SAP events are uploaded to the project chunk by chunk while they are extracted, without being
+    written to a KNIME table first.
 
-        # Retrieve the root element of the XML document.
-        root = xml_tree.getroot()
+    Key Features:
 
-        # Create an empty DataFrame with the desired columns
-        columns = ['Case ID', 'Entity ID', 'Entity Name']
-        df = pd.DataFrame(columns=columns)
+    - **Streaming Upload**: The response of SAP is parsed while it is received, and every chunk of events is
+      uploaded as soon as it is ready, so that the extraction and the upload overlap and only a few chunks are held
+      in memory.
+    - **SAP Extraction**: Supports the same processes, date windows and incremental extraction as the iGrafx SAP
+      Data Fetcher node.
+    - **Column Mapping Support**: The column mapping of the project is given in JSON format, the columns of the
+      events being the ones of the SAP Table of the iGrafx SAP Data Fetcher node.
+    - **Delta Upload**: Optionally uploads only the events that were not sent to the project by previous
+      executions, such as the events of the overlap of an incremental extraction.
 
-        # Find all XML elements with the tag name 'Case' that are children of the 'Cases'
-        case_elements = root.findall('Cases/Case')
+    Unlike the iGrafx SAP Data Fetcher node, the rows of the documents without any event are not uploaded.
 
-        data_list = []
+    Please contact us in order to get access to the SAP extension.
 
-        # Iterate over Case elements
-        for case_element in case_elements:
-            case_id = case_element.attrib['id']
+    """
 
-            doc_group_elements = case_element.findall('DocGroup')
+    sap_connection = SAPConnectionSettings()
+    sap_extraction = SAPExtractionSettings()
 
-            # Iterate over DocGroup elements
-            for doc_group_element in doc_group_elements:
-                entity_element = doc_group_element.find('Entity')
-                document_element = doc_group_element.find('Document')
+    column_dict = knext.StringParameter("Column Mapping",
+                                        "The column mapping of the events in JSON format. The columns are Case ID, "
+                                        "Entity ID, Entity Name, Document ID, Task Name, Event Type and Timestamp.")
+    given_project_id = knext.StringParameter("Project ID",
+                                             "The ID of the project you want to upload the events to.")
+    chunk_size = knext.IntParameter("Number of Events per Chunk",
+                                    "The number of events uploaded in every file. The default value is 100,000.",
+                                    100000,
+                                    min_value=1)
+    upload = UploadSettings()
 
-                entity_id = entity_element.attrib['id'] if entity_element is not None else ""
-                entity_name = entity_element.text if entity_element is not None else ""
-                document_id = document_element.attrib['id'] if document_element is not None else ""
+    def configure(self, configure_context, connection_spec, input_schema):
+        # Set warning during configuration
+        configure_context.set_warning("Uploading SAP Data to iGrafx")
 
-                event_elements = doc_group_element.findall('.//Header/Events/Event')
+    def execute(self, exec_context, connection, input_data):
 
-                # Check if there are any Event elements
-                if not event_elements:
-                    # Append a row without Event information
-                    data_list.append({
-                        'Case ID': case_id,
-                        'Entity ID': entity_id,
-                        'Entity Name': entity_name,
-                        'Document ID': document_id,
-                        'Task Name': "",
-                        'Event Type': "",
-                        'Timestamp': ""
-                    })
+        # Get Workgroup object from the previous node
+        wg = _get_workgroup(connection)
 
-                # Iterate over Event elements
-                for event_element in event_elements:
-                    event_type = event_element.attrib['type']
-                    event_ts = event_element.attrib['ts']
+        # Retrieve project ID from flow variables or manually set if provided
+        if not self.given_project_id:
+            if 'new_project_id' not in exec_context.flow_variables:
+                raise ValueError("No project ID was given as a parameter or fetched from flow variables.")
+            else:
+                project_id = exec_context.flow_variables["new_project_id"]
+        else:
+            project_id = self.given_project_id
+            exec_context.flow_variables["new_project_id"] = project_id
 
-                    task_name = f"{event_type} {entity_name}"
+        my_project = wg.project_from_id(project_id)
 
-                    # Append a new row to the DataFrame
-                    data_list.append({
-                        'Case ID': case_id,
-                        'Entity ID': entity_id,
-                        'Entity Name': entity_name,
-                        'Document ID': document_id,
-                        'Task Name': task_name,
-                        'Event Type': event_type,
-                        'Timestamp': event_ts
-                    })
+        if not self.column_dict:
+            if 'column_mapping' not in exec_context.flow_variables:
+                raise ValueError("No column mapping was given as a parameter or fetched from flow variables.")
+            else:
+                column_mapping = exec_context.flow_variables["column_mapping"]
+        else:
+            column_mapping = self.column_dict
+            exec_context.flow_variables["column_mapping"] = column_mapping
 
-        df = pd.DataFrame(data_list)
+        file_structure = igx.FileStructure(charset="UTF-8", file_type=igx.FileType.csv)
 
-        # Drop empty columns
-        df.replace('', pd.NA, inplace=True)
-        df.dropna(axis=1, how='all', inplace=True)
+        column_mapping = igx.ColumnMapping.from_json(column_mapping)
 
-        if 'Timestamp' in df.columns:
-            # Execute the line only if 'Timestamp' column exists
-            df['Timestamp'] = df['Timestamp'].str.replace(" CET", "")
-            # df = df.loc[(df['Timestamp'] >= start_date) & (df['Timestamp'] <= end_date)]
+        my_project.add_column_mapping(file_structure, column_mapping)
+        _invalidate_project_metadata(my_project)
+
+        with contextlib.ExitStack() as stack:
+            delta_index = None
+            if self.upload.delta_upload:
+                state_db = stack.enter_context(contextlib.closing(_open_state_db(exec_context)))
+                delta_index = _DeltaIndex(state_db, project_id, column_mapping, reset=self.upload.reset_delta_index)
+
+            # Every batch of parsed events is a chunk, uploaded while the next ones are extracted
+            tables, watermark = _extract_sap_tables(exec_context, stack, self.sap_extraction,
+                                                    self.sap_connection, self.chunk_size)
+            # The rows of the documents without any event, which are the only ones without a task name, have no
+            # activity nor timestamp to be mined and are not uploaded
+            event_tables = (table.filter(pc.is_valid(table.column('Task Name'))) for table in tables)
+            chunks = (table.to_pandas() for table in event_tables if table.num_rows)
+            if delta_index is not None:
+                chunks = (chunk for chunk in map(delta_index.filter_new_rows, chunks) if not chunk.empty)
+
+            # List to store info about each uploaded file, in the order of the chunks
+            uploaded_files_info = []
+            uploaded_rows = 0
+            for file_info, chunk_rows in _upload_chunks(my_project, chunks, file_structure.charset,
+                                                        self.upload.upload_format, self.upload.max_concurrent_uploads,
+                                                        self.upload.upload_retries, delta_index=delta_index):
+                uploaded_files_info.append(file_info)
+                uploaded_rows += chunk_rows
+                LOGGER.info(f"Uploaded {uploaded_rows} SAP events to the project {project_id}")
+
+            # The events are only marked as extracted once they are all uploaded
+            if watermark is not None:
+                watermark.save()
 
-        knime_df = knext.Table.from_pandas(df)
+        # Serialize the info about uploaded files to a JSON string
+        exec_context.flow_variables["uploaded_files_info"] = json.dumps(uploaded_files_info)
 
-        return knime_df
+        # Return input data as output
+        return input_data